@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 
 import re
 from datetime import datetime as dt
+from functools import lru_cache
 from math import ceil, log
 from uuid import uuid4
 
@@ -23,6 +24,17 @@ FILE_PREFIX = f'{dt.utcnow().strftime("%Y/%m/%d/%H%M")}/{str(uuid4().hex)[:6]}'
 NONALPHANUM = re.compile(r"([^a-zA-Z\d]+)")
 
 
+@lru_cache(maxsize=4096)
+def sanitize_name(name: str) -> str:
+    """
+    Function to strip all non-alphanumerical characters from a name, i.e. to use it in a logical ID
+
+    :param str name: the name to sanitize
+    :returns: the name without any non-alphanumerical characters
+    """
+    return NONALPHANUM.sub("", name)
+
+
 def clpow2(x):
     """
     Function to return the closest power of two from given x
@@ -6,7 +6,7 @@ Common functions and variables fetched from AWS.
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Iterator, Union
 
 if TYPE_CHECKING:
     from boto3.session import Session
@@ -14,102 +14,303 @@ if TYPE_CHECKING:
     from ecs_composex.common.stacks import ComposeXStack
 
 import re
-from copy import deepcopy
-from datetime import datetime as dt
-from time import sleep
+from collections import ChainMap, defaultdict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from time import monotonic, time
+from weakref import WeakKeyDictionary
 
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, WaiterError
 from compose_x_common.aws import get_assume_role_session, validate_iam_role_arn
 from compose_x_common.aws.arns import ARNS_PER_TAGGINGAPI_TYPE
-from compose_x_common.compose_x_common import keyisset
-from tabulate import tabulate
 
 from ecs_composex.common.logging import LOG
 from ecs_composex.iam import ROLE_ARN_ARG
 
+RESOURCES_LOOKUP_CACHE_TTL = 60
+_RESOURCES_LOOKUP_CACHE: WeakKeyDictionary = WeakKeyDictionary()
+_CLIENTS_CACHE: WeakKeyDictionary = WeakKeyDictionary()
+ASSUMED_ROLE_SESSIONS_EXPIRY_MARGIN = timedelta(seconds=60)
+ASSUMED_ROLE_SESSIONS_CACHE_MAX_SIZE = 32
+_ASSUMED_ROLE_SESSIONS_CACHE: WeakKeyDictionary = WeakKeyDictionary()
+
+
+@lru_cache(maxsize=None)
+def _arn_re(pattern: str) -> re.Pattern:
+    """
+    Compiles the ARN regular expression once, and returns the cached pattern for subsequent lookups.
+    """
+    return re.compile(pattern)
+
+
+def get_arns_names(re_finder: re.Pattern, arns: list[str]) -> list[tuple[str, str]]:
+    """
+    Function to extract the name (first group) of the ARNs matching the regex, as (arn, name) tuples.
+    """
+    return [
+        (arn, _match.group(1))
+        for arn, _match in zip(arns, map(re_finder.match, arns))
+        if _match
+    ]
+
+
+def get_cached_client(session: Session, service: str, region_name: str = None):
+    """
+    Function to re-use the boto3 client of a given session for a service and region, instead of creating
+    a new one for every API call.
+    """
+    session_clients = _CLIENTS_CACHE.setdefault(session, {})
+    key = (service, region_name)
+    if key not in session_clients:
+        session_clients[key] = session.client(service, region_name=region_name)
+    return session_clients[key]
+
 
 def get_cross_role_session(
     session: Session, arn: str, region_name: str = None, session_name: str = None
 ) -> Session:
     """
-    Function to override ComposeXSettings session to specific session for Lookup
+    Function to override ComposeXSettings session to specific session for Lookup.
+    The assumed role session is re-used for the same source session, role, region and session name until its
+    credentials are about to expire. Keeps up to ASSUMED_ROLE_SESSIONS_CACHE_MAX_SIZE sessions per source session.
     """
     if not session_name:
         session_name = "ComposeX@Lookup"
+    role_sessions = _ASSUMED_ROLE_SESSIONS_CACHE.setdefault(session, {})
+    cache_key = (arn, region_name, session_name)
+    if cache_key in role_sessions:
+        expires_at, role_session = role_sessions.pop(cache_key)
+        if expires_at > datetime.now(timezone.utc):
+            role_sessions[cache_key] = (expires_at, role_session)
+            return role_session
     try:
-        return get_assume_role_session(
-            session, arn, session_name=session_name, region=region_name
+        role_session, creds = get_assume_role_session(
+            session,
+            arn,
+            session_name=session_name,
+            region=region_name,
+            include_full_return=True,
         )
     except ClientError:
         LOG.error(f"Failed to use the Role ARN {arn}")
         raise
+    if len(role_sessions) >= ASSUMED_ROLE_SESSIONS_CACHE_MAX_SIZE:
+        del role_sessions[next(iter(role_sessions))]
+    role_sessions[cache_key] = (
+        creds["Credentials"]["Expiration"] - ASSUMED_ROLE_SESSIONS_EXPIRY_MARGIN,
+        role_session,
+    )
+    return role_session
+
+
+def is_iam_role_arn(arn: str) -> bool:
+    """
+    Checks the string is an IAM role ARN (same format as compose_x_common IAM_ROLE_ARN_RE) using string
+    operations only.
+    """
+    if not isinstance(arn, str) or not arn.startswith("arn:aws"):
+        return False
+    parts = arn.split(":", 5)
+    if len(parts) != 6 or parts[2] != "iam" or parts[3]:
+        return False
+    partition, account_id, resource = parts[1], parts[4], parts[5]
+    if partition != "aws" and not (
+        partition.startswith("aws-")
+        and len(partition) > 4
+        and all("a" <= char <= "z" for char in partition[4:])
+    ):
+        return False
+    if len(account_id) != 12 or not (account_id.isascii() and account_id.isdigit()):
+        return False
+    role_name = resource[5:]
+    return (
+        resource.startswith("role/")
+        and bool(role_name)
+        and not any(char.isspace() for char in role_name)
+    )
 
 
 def define_lookup_role_from_info(info: dict, session: Session) -> Session:
     """
     Function to override ComposeXSettings session to specific session for Lookup
     """
-    if not keyisset(ROLE_ARN_ARG, info):
+    role_arn = info.get(ROLE_ARN_ARG)
+    if not role_arn:
         return session
-    validate_iam_role_arn(info[ROLE_ARN_ARG])
-    return get_cross_role_session(session, info[ROLE_ARN_ARG])
+    if not is_iam_role_arn(role_arn):
+        validate_iam_role_arn(role_arn)
+    return get_cross_role_session(session, role_arn)
 
 
 def set_filters_from_tags_list(tags: list) -> list:
     """
     Simple function to define the tags filters to use
     """
-    filters = []
-    filters_mapping = {}
+    filters_mapping = defaultdict(list)
     for tag in tags:
         for key, value in tag.items():
-            if key not in filters_mapping.keys():
-                if not isinstance(value, list):
-                    filters_mapping[key] = [value]
-                else:
-                    filters_mapping[key] += value
+            if isinstance(value, list):
+                filters_mapping[key].extend(value)
             else:
                 filters_mapping[key].append(value)
-    for key, values in filters_mapping.items():
-        filters.append({"Key": key, "Values": tuple(values)})
+    return [
+        {"Key": key, "Values": tuple(values)} for key, values in filters_mapping.items()
+    ]
+
+
+def canonicalize_filter_tags(filters: list[dict]) -> tuple[dict, ...]:
+    """
+    Function to sort the tags filters by key, and their values, so that the same tags always render the same
+    filters, regardless of the order they were defined in.
+    """
+    return tuple(
+        sorted(
+            (
+                {
+                    "Key": _filter["Key"],
+                    "Values": tuple(sorted(map(str, _filter["Values"]))),
+                }
+                for _filter in filters
+            ),
+            key=lambda _filter: _filter["Key"],
+        )
+    )
+
+
+TAG_FILTER_VALUE_TYPES = (list, str, int)
+
+
+def set_filters_from_tags_mapping(tags: dict) -> list:
+    """
+    Simple function to define the tags filters to use from a key/value(s) mapping.
+    Ignores non-string keys, and values that are not a list, string or integer.
+    """
+    filters = []
+    for key, values in tags.items():
+        if not isinstance(key, str) or not isinstance(values, TAG_FILTER_VALUE_TYPES):
+            continue
+        if isinstance(values, list):
+            filters.append({"Key": key, "Values": tuple(values)})
+        else:
+            filters.append({"Key": key, "Values": (str(values),)})
     return filters
 
 
-def define_tagsgroups_filter_tags(tags: list[dict]) -> list:
+TAGS_FILTERS_BUILDERS = {
+    list: set_filters_from_tags_list,
+    dict: set_filters_from_tags_mapping,
+}
+
+
+def define_tagsgroups_filter_tags(tags: list[dict]) -> tuple[dict, ...]:
     """
     Function to create the filters out of tags list
     """
-    if isinstance(tags, list):
-        return set_filters_from_tags_list(tags)
-    elif isinstance(tags, dict):
-        _tags = [
-            {
-                "Key": key,
-                "Values": (str(values) if isinstance(values, int) else values,),
-            }
-            for key, values in tags.items()
-            if isinstance(values, (list, str, int)) and isinstance(key, str)
-        ]
-        return _tags
-    raise TypeError("Tags must be one of", [list, dict], "Got", type(tags))
+    filters_builder = TAGS_FILTERS_BUILDERS.get(type(tags))
+    if filters_builder is None:
+        filters_builder = next(
+            (
+                builder
+                for tags_type, builder in TAGS_FILTERS_BUILDERS.items()
+                if isinstance(tags, tags_type)
+            ),
+            None,
+        )
+    if filters_builder is None:
+        raise TypeError("Tags must be one of", [list, dict], "Got", type(tags))
+    return canonicalize_filter_tags(filters_builder(tags))
+
+
+def iter_resources_from_tags(
+    session: Session, resource_types: list[str], search_tags: list
+) -> Iterator[dict]:
+    """
+    Generator yielding the resources (ResourceTagMappingList items) matching the types and tags, fetching the
+    Resource Groups Tagging API pages only as they get consumed.
+    """
+    client = get_cached_client(session, "resourcegroupstaggingapi")
+    for page in client.get_paginator("get_resources").paginate(
+        ResourceTypeFilters=list(resource_types), TagFilters=search_tags
+    ):
+        yield from page.get("ResourceTagMappingList", [])
+
+
+def get_resources_lookup_cache_key(
+    aws_resource_search: str,
+    search_tags: list,
+    max_resources: int = None,
+) -> Union[tuple, None]:
+    """
+    Function to define the cache key of a Tagging API lookup. Returns None if the tags cannot be hashed.
+    """
+    try:
+        canonical_tags = tuple(
+            sorted(
+                ((_filter["Key"], tuple(_filter["Values"])) for _filter in search_tags),
+                key=lambda _filter: _filter[0],
+            )
+        )
+        key = (aws_resource_search, canonical_tags, max_resources)
+        hash(key)
+        return key
+    except TypeError:
+        return None
 
 
 def get_resources_from_tags(
-    session: Session, aws_resource_search: str, search_tags: list
+    session: Session,
+    aws_resource_search: str,
+    search_tags: list,
+    max_resources: int = None,
 ) -> Union[dict, None]:
     """
-    Function to retrieve AWS Resources ARNs from the tags using the Resource Groups Tagging API
+    Function to retrieve AWS Resources ARNs from the tags using the Resource Groups Tagging API.
+    Successful results are cached for RESOURCES_LOOKUP_CACHE_TTL seconds, per session, type and tags.
     """
+    cache_key = get_resources_lookup_cache_key(
+        aws_resource_search, search_tags, max_resources
+    )
+    session_cache = _RESOURCES_LOOKUP_CACHE.setdefault(session, {})
+    if cache_key in session_cache:
+        expires_at, cached_resources = session_cache[cache_key]
+        if expires_at > monotonic():
+            return cached_resources
+        del session_cache[cache_key]
     try:
-        client = session.client("resourcegroupstaggingapi")
-        resources_r = client.get_resources(
-            ResourceTypeFilters=[aws_resource_search], TagFilters=search_tags
-        )
-        return resources_r
+        resources = []
+        for resource in iter_resources_from_tags(
+            session, [aws_resource_search], search_tags
+        ):
+            resources.append(resource)
+            if max_resources and len(resources) >= max_resources:
+                break
     except ClientError as error:
         LOG.error(error)
         LOG.error("Not processing this resource. Skipping")
         return None
+    resources_r = {"ResourceTagMappingList": resources}
+    if cache_key is not None:
+        session_cache[cache_key] = (
+            monotonic() + RESOURCES_LOOKUP_CACHE_TTL,
+            resources_r,
+        )
+    return resources_r
+
+
+def get_resources_arns_from_tags(
+    session: Session,
+    aws_resource_search: str,
+    search_tags: list,
+    max_resources: int = None,
+) -> list[str]:
+    """
+    Function to retrieve the ARNs of the AWS Resources matching the tags.
+    """
+    resources_r = get_resources_from_tags(
+        session, aws_resource_search, search_tags, max_resources
+    )
+    resources = resources_r.get("ResourceTagMappingList") if resources_r else None
+    return [i["ResourceARN"] for i in resources] if resources else []
 
 
 def handle_multi_results(
@@ -121,33 +322,27 @@ def handle_multi_results(
     :raises LookupError:
     :return: The ARN(s) of the resource matching the name. Supports to return multiple ARNs
     """
-    found = 0
-    found_arn = None
-    re_finder = re.compile(regexp)
-    for arn in arns:
-        found_name = re_finder.match(arn).groups()[0]
-        if found_name and found_name == name:
-            found += 1
-            found_arn = arn
-    if found == 1:
+    re_finder = _arn_re(regexp)
+    found_names = get_arns_names(re_finder, arns)
+    matching_arns = [arn for arn, found_name in found_names if found_name == name]
+    if len(matching_arns) == 1:
         LOG.info(f"Matched {res_type} {name}")
-        return found_arn
-    elif not allow_multi and found > 1:
-        raise LookupError(
-            f"More than one result was found for {name} / {res_type} "
-            "but could not match the name to a single resource."
-            "Found",
-            arns,
-        )
-    elif found == 0:
+        return matching_arns[0]
+    if not matching_arns:
         raise LookupError(
             f"No {res_type} named {name} was found with the provided tags."
             " Found with provided tags",
-            [re_finder.match(arn).groups()[0] for arn in arns],
+            [found_name for _, found_name in found_names],
         )
-    elif allow_multi and found > 1:
+    if allow_multi:
         LOG.info(f"Found multiple resources for {res_type} and Name/Id {name}.")
         return arns
+    raise LookupError(
+        f"More than one result was found for {name} / {res_type} "
+        "but could not match the name to a single resource."
+        "Found",
+        arns,
+    )
 
 
 def handle_search_results(
@@ -161,22 +356,22 @@ def handle_search_results(
     Function to parse tag resource search results
 
     """
-    if not arns:
+    arns_count = len(arns)
+    if arns_count == 1:
+        return arns[0]
+    if not arns_count:
         raise LookupError(
             "No resources were found with the provided tags and information",
             name,
             aws_resource_search,
         )
-    elif not allow_multi and len(arns) > 1:
-        raise LookupError(
-            f"More than one resource {name}:{aws_resource_search} was found with the current tags."
-            "Found",
-            arns,
-        )
-    elif allow_multi and len(arns) > 1:
+    if allow_multi:
         return arns
-    else:
-        return arns[0]
+    raise LookupError(
+        f"More than one resource {name}:{aws_resource_search} was found with the current tags."
+        "Found",
+        arns,
+    )
 
 
 def validate_search_input(res_types: dict, res_type: str) -> None:
@@ -211,72 +406,70 @@ def find_aws_resource_arn_from_tags_api(
     :param dict types: Additional types to match.
     :return:
     """
-    res_types = deepcopy(ARNS_PER_TAGGINGAPI_TYPE)
-    if types is not None and isinstance(types, dict):
-        res_types.update(types)
-    search_tags = (
-        define_tagsgroups_filter_tags(info["Tags"]) if keyisset("Tags", info) else ()
+    res_types = (
+        ChainMap(types, ARNS_PER_TAGGINGAPI_TYPE)
+        if types and isinstance(types, dict)
+        else ARNS_PER_TAGGINGAPI_TYPE
+    )
+    tags = info.get("Tags")
+    search_tags = define_tagsgroups_filter_tags(tags) if tags else ()
+    name = info.get("Name") or None
+
+    resource_arns = get_resources_arns_from_tags(
+        session,
+        aws_resource_search,
+        search_tags,
+        max_resources=None if allow_multi else 2,
     )
-    name = info["Name"] if keyisset("Name", info) else None
-
-    resources_r = get_resources_from_tags(session, aws_resource_search, search_tags)
     LOG.debug(search_tags)
-    if not resources_r or not keyisset("ResourceTagMappingList", resources_r):
-        resource_arns = []
-    else:
-        resource_arns = [
-            i["ResourceARN"] for i in resources_r["ResourceTagMappingList"]
-        ]
+    if not allow_multi and len(resource_arns) > 1:
+        resource_arns = get_resources_arns_from_tags(
+            session, aws_resource_search, search_tags
+        )
     return handle_search_results(
         resource_arns, name, res_types, aws_resource_search, allow_multi=allow_multi
     )
 
 
-def assert_can_create_stack(client, name: str) -> bool:
+STACK_CAN_UPDATE_STATUSES = (
+    "CREATE_COMPLETE",
+    "ROLLBACK_COMPLETE",
+    "UPDATE_COMPLETE",
+    "UPDATE_ROLLBACK_COMPLETE",
+)
+STACK_CREATE = "create"
+STACK_UPDATE = "update"
+STACK_BLOCKED = "blocked"
+
+
+def get_stack_deploy_state(client, name: str) -> str:
     """
-    Checks whether a stack already exists or not
+    Describes the stack once to determine whether it can be created (STACK_CREATE), updated (STACK_UPDATE)
+    or neither (STACK_BLOCKED).
 
     :raises: LookupError
     :raises: ClientError
     """
     try:
-        stack_r = client.describe_stacks(StackName=name)
-        if not keyisset("Stacks", stack_r):
-            return True
-        stacks = stack_r["Stacks"]
-        if len(stacks) != 1:
-            raise LookupError("Too many stacks found with stack name", name)
-        stack = stacks[0]
-        if stack["StackStatus"] == "REVIEW_IN_PROGRESS":
-            return stack
-        return False
+        stacks = client.describe_stacks(StackName=name).get("Stacks")
     except ClientError as error:
         if (
             error.response["Error"]["Code"] == "ValidationError"
             and error.response["Error"]["Message"].find("does not exist") > 0
         ):
-            return True
+            return STACK_CREATE
         raise error
-
-
-def assert_can_update_stack(client, name) -> bool:
-    """
-    Checks whether a stack already exists or not
-    """
-    can_update_statuses = [
-        "CREATE_COMPLETE",
-        "ROLLBACK_COMPLETE",
-        "UPDATE_COMPLETE",
-        "UPDATE_ROLLBACK_COMPLETE",
-    ]
-    res = client.describe_stacks(StackName=name)
-    if not res["Stacks"]:
-        return False
-    stack = res["Stacks"][0]
-    LOG.info(stack["StackStatus"])
-    if stack["StackStatus"] in can_update_statuses:
-        return True
-    return False
+    if not stacks:
+        return STACK_CREATE
+    if len(stacks) != 1:
+        raise LookupError("Too many stacks found with stack name", name)
+    stack_status = stacks[0]["StackStatus"]
+    if stack_status == "REVIEW_IN_PROGRESS":
+        return STACK_CREATE
+    LOG.info(stack_status)
+    if stack_status in STACK_CAN_UPDATE_STATUSES:
+        return STACK_UPDATE
+    return STACK_BLOCKED
 
 
 def validate_can_deploy_stack_from_settings(
@@ -303,8 +496,9 @@ def deploy(settings: ComposeXSettings, root_stack: ComposeXStack) -> Union[str,
     Function to deploy (create or update) the stack to CFN.
     """
     validate_can_deploy_stack_from_settings(settings, root_stack)
-    client = settings.session.client("cloudformation")
-    if assert_can_create_stack(client, settings.name):
+    client = get_cached_client(settings.session, "cloudformation")
+    stack_state = get_stack_deploy_state(client, settings.name)
+    if stack_state == STACK_CREATE:
         res = client.create_stack(
             StackName=settings.name,
             Capabilities=["CAPABILITY_IAM", "CAPABILITY_AUTO_EXPAND"],
@@ -315,7 +509,7 @@ def deploy(settings: ComposeXSettings, root_stack: ComposeXStack) -> Union[str,
         LOG.info(f"Stack {settings.name} successfully deployed.")
         LOG.info(res["StackId"])
         return res["StackId"]
-    elif assert_can_update_stack(client, settings.name):
+    elif stack_state == STACK_UPDATE:
         LOG.warning(f"Stack {settings.name} already exists. Updating.")
         res = client.update_stack(
             StackName=settings.name,
@@ -330,6 +524,50 @@ def deploy(settings: ComposeXSettings, root_stack: ComposeXStack) -> Union[str,
     return None
 
 
+CHANGE_SET_COLUMNS = ("LogicalResourceId", "ResourceType", "Action")
+
+
+def iter_change_set_rows(changes: list[dict]) -> Iterator[tuple[str, str, str]]:
+    """
+    Generator of the change set changes columns values
+    """
+    for change in changes:
+        resource_change = change["ResourceChange"]
+        yield (
+            resource_change["LogicalResourceId"],
+            resource_change["ResourceType"],
+            resource_change["Action"],
+        )
+
+
+def iter_change_set_table_lines(changes: list[dict]) -> Iterator[str]:
+    """
+    Generator of the lines of the reStructuredText simple table of the change set changes.
+    Iterates once over the changes to size the columns, and once more to render the rows.
+    """
+    widths = [len(column) + 2 for column in CHANGE_SET_COLUMNS]
+    for row in iter_change_set_rows(changes):
+        widths = [max(width, len(value)) for width, value in zip(widths, row)]
+    border = "  ".join("=" * width for width in widths)
+    yield border
+    yield "  ".join(
+        f"{column:<{width}}" for column, width in zip(CHANGE_SET_COLUMNS, widths)
+    ).rstrip()
+    yield border
+    for row in iter_change_set_rows(changes):
+        yield "  ".join(
+            f"{value:<{width}}" for value, width in zip(row, widths)
+        ).rstrip()
+    yield border
+
+
+def render_change_set_changes(changes: list[dict]) -> str:
+    """
+    Function to render the change set changes as a reStructuredText simple table.
+    """
+    return "\n".join(iter_change_set_table_lines(changes))
+
+
 def get_change_set_status(
     client, change_set_name: str, settings: ComposeXSettings
 ) -> str:
@@ -342,48 +580,23 @@ def get_change_set_status(
     If the changeset already exists, in a ready status, we dump a display of expected changes and return the status.
 
     """
-    pending_statuses = [
-        "CREATE_PENDING",
-        "CREATE_IN_PROGRESS",
-        "DELETE_PENDING",
-        "DELETE_IN_PROGRESS",
-        "REVIEW_IN_PROGRESS",
-        "UPDATE_ROLLBACK_IN_PROGRESS",
-    ]
-    success_statuses = ["CREATE_COMPLETE", "DELETE_COMPLETE"]
-    failed_statuses = ["DELETE_FAILED", "FAILED", "UPDATE_ROLLBACK_FAILED"]
-    ready = False
-    status = None
-    while not ready:
-        status = client.describe_change_set(
-            ChangeSetName=change_set_name, StackName=settings.name
-        )
-        if status["Status"] in failed_statuses:
-            raise SystemExit("Change set is unsucessful", status["Status"])
-        if status["Status"] in pending_statuses:
-            print(
-                "ChangeSet creation in progress. Waiting 10 seconds",
-                end="\r",
-                flush=True,
-            )
-            sleep(10)
-        elif status["Status"] in success_statuses:
-            ready = True
-
-    print(
-        tabulate(
-            [
-                [
-                    change["ResourceChange"]["LogicalResourceId"],
-                    change["ResourceChange"]["ResourceType"],
-                    change["ResourceChange"]["Action"],
-                ]
-                for change in status["Changes"]
-            ],
-            ["LogicalResourceId", "ResourceType", "Action"],
-            tablefmt="rst",
+    waiter = client.get_waiter("change_set_create_complete")
+    print("ChangeSet creation in progress. Waiting", end="\r", flush=True)
+    try:
+        waiter.wait(
+            ChangeSetName=change_set_name,
+            StackName=settings.name,
+            WaiterConfig={"Delay": 5, "MaxAttempts": 120},
         )
+    except WaiterError as error:
+        status = error.last_response.get("Status") if error.last_response else None
+        raise SystemExit("Change set is unsucessful", status or str(error))
+    status = client.describe_change_set(
+        ChangeSetName=change_set_name, StackName=settings.name
     )
+
+    for line in iter_change_set_table_lines(status["Changes"]):
+        print(line)
     return status
 
 
@@ -397,11 +610,9 @@ def plan(
     Function to create a recursive change-set and return diffs
     """
     validate_can_deploy_stack_from_settings(settings, root_stack)
-    client = settings.session.client("cloudformation")
-    change_set_name = f"{settings.name}" + "-ecs-compose-x-" + dt.now().strftime("%s")
-    if assert_can_create_stack(client, settings.name) or assert_can_update_stack(
-        client, settings.name
-    ):
+    client = get_cached_client(settings.session, "cloudformation")
+    change_set_name = f"{settings.name}-ecs-compose-x-{int(time())}"
+    if get_stack_deploy_state(client, settings.name) != STACK_BLOCKED:
         client.create_change_set(
             StackName=settings.name,
             Capabilities=["CAPABILITY_IAM", "CAPABILITY_AUTO_EXPAND"],
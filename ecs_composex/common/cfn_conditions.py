@@ -11,6 +11,11 @@ USE_STACK_NAME_CON_T = "UseStackName"
 USE_STACK_NAME_CON = Equals(
     Ref(cfn_params.ROOT_STACK_NAME), cfn_params.ROOT_STACK_NAME.Default
 )
+STACK_NAME_IF = If(
+    USE_STACK_NAME_CON_T,
+    Ref("AWS::StackName"),
+    Ref(cfn_params.ROOT_STACK_NAME),
+)
 
 
 def pass_root_stack_name():
@@ -19,13 +24,7 @@ def pass_root_stack_name():
 
     :return: rootstack name value based on condition
     """
-    return {
-        cfn_params.ROOT_STACK_NAME_T: If(
-            USE_STACK_NAME_CON_T,
-            Ref("AWS::StackName"),
-            Ref(cfn_params.ROOT_STACK_NAME),
-        )
-    }
+    return {cfn_params.ROOT_STACK_NAME_T: STACK_NAME_IF}
 
 
 def define_stack_name(template=None):
@@ -38,8 +37,4 @@ def define_stack_name(template=None):
     """
     if template and USE_STACK_NAME_CON_T not in template.conditions:
         template.add_condition(USE_STACK_NAME_CON_T, USE_STACK_NAME_CON)
-    return If(
-        USE_STACK_NAME_CON_T,
-        Ref("AWS::StackName"),
-        Ref(cfn_params.ROOT_STACK_NAME),
-    )
+    return STACK_NAME_IF
@@ -46,6 +46,7 @@ from ecs_composex.mods_manager import XResourceModule
 from ecs_composex.resource_settings import get_parameter_settings
 
 ENV_VAR_NAME = re.compile(r"([^a-zA-Z0-9_]+)")
+ENV_VAR_NAME_SEPARATORS = str.maketrans("-.", "__")
 
 
 class XResource:
@@ -14,8 +14,9 @@ if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
     from ecs_composex.ecs.ecs_service import EcsService
 
-import re
+from functools import cached_property
 from itertools import chain
+from operator import attrgetter
 
 from troposphere import AWS_STACK_NAME, GetAtt, If, Join, NoValue
 from troposphere import Output as CfnOutput
@@ -28,6 +29,7 @@ from troposphere.ecs import (
     TaskDefinition,
 )
 
+from ecs_composex.common import NONALPHANUM
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import Parameter, add_outputs, add_parameters
@@ -35,11 +37,21 @@ from ecs_composex.compose.compose_services import ComposeService
 from ecs_composex.ecs import ecs_conditions, ecs_params
 from ecs_composex.ecs.ecs_family.family_helpers import (
     handle_same_task_services_dependencies,
+    set_service_dependency_on_all_iam_policies,
+)
+from ecs_composex.ecs.ecs_family.family_helpers.compute_finalizers import (
+    finalize_family_compute,
+    finalize_scaling_settings,
+)
+from ecs_composex.ecs.ecs_family.family_helpers.network_finalizers import (
+    finalize_lb_settings,
+    finalize_network_settings,
 )
 from ecs_composex.ecs.ecs_family.family_logging import FamilyLogging
 from ecs_composex.ecs.ecs_params import SERVICE_T, TASK_T
 from ecs_composex.ecs.ecs_prometheus import set_prometheus
 from ecs_composex.ecs.managed_sidecars.aws_xray import set_xray
+from ecs_composex.ecs.service_alarms import handle_alarms
 from ecs_composex.ecs.service_compute import ServiceCompute
 from ecs_composex.ecs.service_networking import ServiceNetworking
 from ecs_composex.ecs.service_networking.helpers import (
@@ -50,10 +62,74 @@ from ecs_composex.ecs.service_scaling import ServiceScaling
 from ecs_composex.ecs.task_compute import TaskCompute
 from ecs_composex.ecs.task_iam import TaskIam
 
-from .family_helpers import assign_secrets_to_roles, ensure_essential_containers
+from .family_helpers import (
+    assign_secrets_to_roles,
+    ensure_essential_containers,
+    swap_environment_value_with_parameter,
+)
 from .family_template import set_template
+from .task_execute_command import (
+    apply_ecs_execute_command_permissions,
+    set_enable_execute_command,
+)
 from .task_runtime import define_family_runtime_parameters
 
+SERVICE_NAME_REF = Ref(ecs_params.SERVICE_NAME)
+STACK_NAME_REF = Ref(AWS_STACK_NAME)
+TASK_NETWORK_MODE_IF = If(
+    ecs_conditions.USE_WINDOWS_OS_T,
+    NoValue,
+    If(
+        ecs_conditions.USE_FARGATE_CON_T,
+        "awsvpc",
+        Ref(ecs_params.NETWORK_MODE),
+    ),
+)
+TASK_IPC_MODE_IF = If(
+    ecs_conditions.USE_WINDOWS_OS_T,
+    NoValue,
+    If(
+        ecs_conditions.USE_EC2_OR_EXTERNAL_LT_CON_T,
+        Ref(ecs_params.IPC_MODE),
+        NoValue,
+    ),
+)
+TASK_REQUIRES_COMPATIBILITIES_IF = ecs_conditions.use_external_lt_con(
+    ["EXTERNAL"],
+    If(
+        ecs_conditions.USE_FARGATE_CON_T,
+        ["FARGATE"],
+        If(ecs_conditions.USE_EC2_CON_T, ["EC2"], ["EC2", "FARGATE"]),
+    ),
+)
+TASK_RUNTIME_PLATFORM_IF = If(
+    ecs_conditions.USE_FARGATE_CON_T,
+    RuntimePlatform(
+        CpuArchitecture=Ref(ecs_params.RUNTIME_CPU_ARCHITECTURE),
+        OperatingSystemFamily=Ref(ecs_params.RUNTIME_OS_FAMILY),
+    ),
+    NoValue,
+)
+
+
+def partition_by_type(items: list, item_type: type) -> tuple[list, list]:
+    """
+    Splits the items in a single pass between the ones of exactly item_type (no subclasses), and the others
+    (i.e. If conditions)
+
+    :return: the items of item_type, the other items
+    """
+    matching: list = []
+    others: list = []
+    add_matching = matching.append
+    add_other = others.append
+    for item in items:
+        if type(item) is item_type:
+            add_matching(item)
+        else:
+            add_other(item)
+    return matching, others
+
 
 class ComposeFamily:
     """
@@ -76,7 +152,10 @@ class ComposeFamily:
         self._compose_services: list[ComposeService] = services
         self.ordered_services: list[ComposeService] = services
         self.managed_sidecars = []
+        self._services: Union[list[ComposeService], None] = None
+        self._task_ephemeral_storage: Union[int, None] = None
         self.name = family_name
+        self._logical_name: str = NONALPHANUM.sub("", self.name)
         self.family_hostname = self.name.replace("_", "-").lower()
         self.services_depends_on: dict = {}
         self.template = set_template(self)
@@ -112,19 +191,31 @@ class ComposeFamily:
 
     @property
     def logical_name(self) -> str:
-        return re.sub(r"[^a-zA-Z0-9]+", "", self.name)
+        return self._logical_name
 
     @property
     def services(self) -> list[ComposeService]:
-        return list(chain(self.managed_sidecars, self.ordered_services))
+        if self._services is None:
+            self._services = list(chain(self.managed_sidecars, self.ordered_services))
+        return self._services
 
-    @property
+    def reset_services(self) -> None:
+        """
+        Drops the services list (managed sidecars then ordered services) and the values computed from it,
+        for them to be re-evaluated on next access.
+        To call whenever services are added to, or re-ordered in, the family.
+        """
+        self._services = None
+        self._task_ephemeral_storage = None
+        self.__dict__.pop("services_names", None)
+
+    @cached_property
     def services_names(self) -> list[str]:
         return [_svc.name for _svc in self.ordered_services]
 
     @property
     def want_xray(self) -> bool:
-        return any([service.x_ray for service in self.services])
+        return any(service.x_ray for service in self.services)
 
     @property
     def service_definition(self) -> Union[None, CfnService]:
@@ -132,13 +223,13 @@ class ComposeFamily:
             return self.ecs_service.ecs_service
         return None
 
-    @property
+    @cached_property
     def service_name_param(self) -> Parameter:
         return Parameter(
             f"{self.logical_name}{SERVICE_T}", group_label="ECS Settings", Type="String"
         )
 
-    @property
+    @cached_property
     def service_arn_param(self) -> Parameter:
         return Parameter(
             f"{self.logical_name}{SERVICE_T}Arn",
@@ -178,6 +269,7 @@ class ComposeFamily:
 
         :param self: the self of services
         """
+        task_ephemeral_storage = self.task_ephemeral_storage
         self.task_definition = TaskDefinition(
             TASK_T,
             template=self.template,
@@ -191,58 +283,30 @@ class ComposeFamily:
                 ecs_params.FARGATE_RAM,
                 self.task_compute.cfn_family_ram,
             ),
-            NetworkMode=If(
-                ecs_conditions.USE_WINDOWS_OS_T,
-                NoValue,
-                If(
-                    ecs_conditions.USE_FARGATE_CON_T,
-                    "awsvpc",
-                    Ref(ecs_params.NETWORK_MODE),
-                ),
-            ),
+            NetworkMode=TASK_NETWORK_MODE_IF,
             EphemeralStorage=(
                 If(
                     ecs_conditions.USE_FARGATE_CON_T,
-                    EphemeralStorage(SizeInGiB=self.task_ephemeral_storage),
+                    EphemeralStorage(SizeInGiB=task_ephemeral_storage),
                     NoValue,
                 )
-                if self.task_ephemeral_storage >= 21
+                if task_ephemeral_storage >= 21
                 else NoValue
             ),
             # InferenceAccelerators=NoValue,
-            IpcMode=If(
-                ecs_conditions.USE_WINDOWS_OS_T,
-                NoValue,
-                If(
-                    ecs_conditions.USE_EC2_OR_EXTERNAL_LT_CON_T,
-                    Ref(ecs_params.IPC_MODE),
-                    NoValue,
-                ),
-            ),
-            Family=Ref(ecs_params.SERVICE_NAME),
+            IpcMode=TASK_IPC_MODE_IF,
+            Family=SERVICE_NAME_REF,
             TaskRoleArn=self.iam_manager.task_role.arn,
             ExecutionRoleArn=self.iam_manager.exec_role.arn,
-            ContainerDefinitions=[s.container_definition for s in self.services],
-            RequiresCompatibilities=ecs_conditions.use_external_lt_con(
-                ["EXTERNAL"],
-                If(
-                    ecs_conditions.USE_FARGATE_CON_T,
-                    ["FARGATE"],
-                    If(ecs_conditions.USE_EC2_CON_T, ["EC2"], ["EC2", "FARGATE"]),
-                ),
-            ),
-            RuntimePlatform=If(
-                ecs_conditions.USE_FARGATE_CON_T,
-                RuntimePlatform(
-                    CpuArchitecture=Ref(ecs_params.RUNTIME_CPU_ARCHITECTURE),
-                    OperatingSystemFamily=Ref(ecs_params.RUNTIME_OS_FAMILY),
-                ),
-                NoValue,
+            ContainerDefinitions=list(
+                map(attrgetter("container_definition"), self.services)
             ),
+            RequiresCompatibilities=TASK_REQUIRES_COMPATIBILITIES_IF,
+            RuntimePlatform=TASK_RUNTIME_PLATFORM_IF,
             Tags=Tags(
                 {
-                    "Name": Ref(ecs_params.SERVICE_NAME),
-                    "Environment": Ref(AWS_STACK_NAME),
+                    "Name": SERVICE_NAME_REF,
+                    "Environment": STACK_NAME_REF,
                     "compose-x::family": self.name,
                     "compose-x::logical_name": self.logical_name,
                 }
@@ -250,10 +314,8 @@ class ComposeFamily:
         )
         for service in self.services:
             service.container_definition.DockerLabels.update(
-                {
-                    "container_name": service.container_name,
-                    "ecs_task_family": Ref(ecs_params.SERVICE_NAME),
-                }
+                container_name=service.container_name,
+                ecs_task_family=SERVICE_NAME_REF,
             )
 
     def import_all_sidecars(self) -> None:
@@ -266,21 +328,22 @@ class ComposeFamily:
         self.set_services_family_links()
 
     def set_services_family_links(self):
+        """
+        Method to set the containers links. Only keeps the compose links (SERVICE or SERVICE:ALIAS) which target
+        another service of the family, and adds the managed sidecars ones.
+        """
+        services_names = set(self.services_names)
+        xray_service = self.xray_service
+        cwagent_service = self.cwagent_service
         for service in self.ordered_services:
-            if service.links:
-                for link in service.links:
-                    for _svc in self.ordered_services:
-                        if _svc == service:
-                            continue
-                        if _svc.name in link:
-                            service.family_links.append(link)
-            if self.xray_service and self.xray_service.name not in service.family_links:
-                service.family_links.append(self.xray_service.name)
-            if (
-                self.cwagent_service
-                and self.cwagent_service.name not in service.family_links
-            ):
-                service.family_links.append(f"{self.cwagent_service.name}:cwagent")
+            for link in service.links or []:
+                target = link.split(":", 1)[0]
+                if target != service.name and target in services_names:
+                    service.family_links.append(link)
+            if xray_service and xray_service.name not in service.family_links:
+                service.family_links.append(xray_service.name)
+            if cwagent_service and cwagent_service.name not in service.family_links:
+                service.family_links.append(f"{cwagent_service.name}:cwagent")
             if service.family_links:
                 setattr(
                     service.container_definition,
@@ -300,42 +363,44 @@ class ComposeFamily:
         """
         Generates a list of CFN outputs for the ECS Service and Task Definition
         """
-        if (
-            self.service_compute.launch_type != "EXTERNAL"
-            and self.service_networking.security_group
-        ):
-            self.outputs.append(
+        outputs: list = []
+        add_output = outputs.append
+        is_external = self.service_compute.launch_type == "EXTERNAL"
+        service_networking = self.service_networking
+        if not is_external and service_networking.security_group:
+            add_output(
                 CfnOutput(
                     f"{self.logical_name}GroupId",
-                    Value=Ref(self.service_networking.security_group.parameter.title),
+                    Value=Ref(service_networking.security_group.parameter.title),
                 )
             )
         if (
-            self.service_networking.subnets_output
-            and isinstance(self.service_networking.subnets_output, Ref)
-            and self.service_compute.launch_type != "EXTERNAL"
+            service_networking.subnets_output
+            and isinstance(service_networking.subnets_output, Ref)
+            and not is_external
         ):
-            self.outputs.append(
+            add_output(
                 CfnOutput(
                     ecs_params.SERVICE_SUBNETS.title,
-                    Value=Join(",", self.service_networking.subnets_output),
+                    Value=Join(",", service_networking.subnets_output),
                 )
             )
 
-        self.outputs.append(
+        add_output(
             CfnOutput(self.task_definition.title, Value=Ref(self.task_definition))
         )
-        if self.service_definition:
-            self.outputs.append(
+        service_definition = self.service_definition
+        if service_definition:
+            add_output(
                 CfnOutput(
                     self.service_name_param.title,
-                    Value=GetAtt(self.service_definition, "Name"),
+                    Value=GetAtt(service_definition, "Name"),
                 )
             )
-            self.outputs.append(
+            add_output(
                 CfnOutput(
                     self.service_arn_param.title,
-                    Value=Ref(self.service_definition),
+                    Value=Ref(service_definition),
                 )
             )
         if (
@@ -343,13 +408,14 @@ class ComposeFamily:
             and self.service_scaling.scalable_target
             and self.service_scaling.scalable_target.title in self.template.resources
         ):
-            self.outputs.append(
+            add_output(
                 CfnOutput(
                     self.service_scaling.scalable_target.title,
                     Value=Ref(self.service_scaling.scalable_target),
                 )
             )
-        add_outputs(self.template, self.outputs)
+        self.outputs.extend(outputs)
+        add_outputs(self.template, outputs)
 
     def state_facts(self):
         """
@@ -366,14 +432,19 @@ class ComposeFamily:
 
     def add_service(self, service: ComposeService):
         """
-        Function to add new services (defined in the compose files). Not to use for managed sidecars
+        Function to add new services (defined in the compose files). Not to use for managed sidecars.
+        Only the new service IAM settings are added. Until the family is initialized (init_family), which sets
+        the containers priority for all services, that update is deferred.
+
         :param ComposeService service:
         """
 
         self._compose_services.append(service)
+        self.reset_services()
 
-        self.set_update_containers_priority()
-        self.iam_manager.init_update_policies()
+        self.iam_manager.init_update_policies([service])
+        if self.task_compute is not None:
+            self.set_update_containers_priority()
         # self.handle_logging()
 
         if self.task_definition and service.container_definition:
@@ -402,6 +473,7 @@ class ComposeFamily:
             )
             return
         self.managed_sidecars.append(service)
+        self.reset_services()
         if self.task_definition and service.container_definition:
             self.task_definition.ContainerDefinitions.append(
                 service.container_definition
@@ -459,18 +531,6 @@ class ComposeFamily:
         Once all services have been added, we add the sidecars and deal with appropriate permissions and settings
         Will add xray / prometheus sidecars
         """
-        from ecs_composex.ecs.ecs_family.family_helpers import (
-            set_service_dependency_on_all_iam_policies,
-        )
-        from ecs_composex.ecs.ecs_family.family_helpers.compute_finalizers import (
-            finalize_family_compute,
-            finalize_scaling_settings,
-        )
-        from ecs_composex.ecs.ecs_family.family_helpers.network_finalizers import (
-            finalize_lb_settings,
-            finalize_network_settings,
-        )
-
         finalize_network_settings(self, settings)
         finalize_family_compute(self)
 
@@ -478,11 +538,9 @@ class ComposeFamily:
         finalize_lb_settings(self)
         finalize_scaling_settings(self)
         self.generate_outputs()
-        service_configs = [
-            [0, service]
-            for service in chain(self.managed_sidecars, self.ordered_services)
-        ]
-        handle_same_task_services_dependencies(service_configs)
+        handle_same_task_services_dependencies(
+            [[0, service] for service in self.services]
+        )
         self.set_add_region_when_external()
         self.sort_secrets_env_vars()
 
@@ -491,8 +549,6 @@ class ComposeFamily:
             service.composed_env_processing(settings)
 
     def set_add_region_when_external(self):
-        from troposphere.ecs import Environment
-
         env_var_to_add = Environment(Name="AWS_DEFAULT_REGION", Value=Region)
         region_conditional = If(
             ecs_conditions.USE_EXTERNAL_LT_T, env_var_to_add, NoValue
@@ -506,25 +562,20 @@ class ComposeFamily:
             ):
                 environment = []
                 setattr(service.container_definition, "Environment", environment)
-            if "AWS_DEFAULT_REGION" not in [
-                _env.Name for _env in environment if isinstance(_env, Environment)
-            ]:
+            if not any(
+                type(_env) is Environment and _env.Name == "AWS_DEFAULT_REGION"
+                for _env in environment
+            ):
                 environment.append(region_conditional)
 
     @staticmethod
     def sort_secrets(service: ComposeService, secrets: list) -> None:
-        """Sorts secrets by Name"""
-        if not secrets:
+        """Sorts secrets by Name. Nothing to sort with fewer than 2 secrets."""
+        if len(secrets) < 2:
             return
-        strictly_secrets: list = []
-        non_secret_type: list = []
-        for _secret in secrets:
-            if isinstance(_secret, Secret):
-                strictly_secrets.append(_secret)
-            else:
-                non_secret_type.append(_secret)
-        sorted_secrets = sorted(strictly_secrets, key=lambda _secret: _secret.Name)
-        sorted_secrets += non_secret_type
+        strictly_secrets, non_secret_type = partition_by_type(secrets, Secret)
+        strictly_secrets.sort(key=attrgetter("Name"))
+        sorted_secrets = strictly_secrets + non_secret_type
         if sorted_secrets:
             setattr(service.container_definition, "Secrets", sorted_secrets)
         else:
@@ -539,28 +590,23 @@ class ComposeFamily:
         checks to remove env vars with Name that'd overlap with an existing secret.
         Favoring secret over environment variable for security, as it's likely more sensitive.
         """
-        strictly_env_vars: list = []
-        non_env_vars: list = []
-        for _env in environment:
-            if isinstance(_env, Environment):
-                strictly_env_vars.append(_env)
-            else:
-                non_env_vars.append(_env)
-        sorted_env = sorted(strictly_env_vars, key=lambda _env_var: _env_var.Name)
+        if len(environment) < 2 and not secrets:
+            return
+        strictly_env_vars, non_env_vars = partition_by_type(environment, Environment)
+        strictly_env_vars.sort(key=attrgetter("Name"))
+        sorted_env = strictly_env_vars
         if sorted_env and (secrets and isinstance(secrets, list)):
-            secrets_names: list[str] = [
-                _secret.Name
-                for _secret in getattr(service.container_definition, "Secrets", [])
-            ]
-            # Iterate in reverse for popping so we don't mess up indexes
-            for _index, _env in reversed(tuple(enumerate(sorted_env))):
+            secrets_names: set[str] = {
+                _secret.Name for _secret in secrets if type(_secret) is Secret
+            }
+            for _env in sorted_env:
                 if _env.Name in secrets_names:
                     LOG.warning(
                         "services.{}: Environment variable {} overlaps with Secret. Removing.".format(
                             service.family.name, _env.Name
                         )
                     )
-                    sorted_env.pop(_index)
+            sorted_env = [_env for _env in sorted_env if _env.Name not in secrets_names]
         sorted_env += non_env_vars
         if sorted_env:
             setattr(service.container_definition, "Environment", sorted_env)
@@ -573,16 +619,13 @@ class ComposeFamily:
         Removes env vars which would have a Key common to secrets
         """
         for service in self.services:
-            secrets: list = getattr(service.container_definition, "Secrets", [])
+            container_definition = service.container_definition
+            secrets: list = getattr(container_definition, "Secrets", []) or []
             if secrets:
                 self.sort_secrets(service, secrets)
-            environment: list = getattr(service.container_definition, "Environment", [])
+            environment: list = getattr(container_definition, "Environment", [])
             if environment:
-                self.sort_env_vars(
-                    service,
-                    environment,
-                    getattr(service.container_definition, "Secrets", []),
-                )
+                self.sort_env_vars(service, environment, secrets)
 
     def set_services_to_services_dependencies(self):
         """
@@ -598,9 +641,8 @@ class ComposeFamily:
                         service.name,
                         service.depends_on,
                     )
-                for service_name, condition_def in service.depends_on.items():
-                    if service_name not in self.services_depends_on:
-                        self.services_depends_on[service_name] = {}
+                for service_name in service.depends_on:
+                    self.services_depends_on.setdefault(service_name, {})
 
     @property
     def task_ephemeral_storage(self) -> int:
@@ -608,16 +650,16 @@ class ComposeFamily:
         If any service ephemeral storage is defined above, sets the ephemeral storage to the maximum of them.
         Return 0 if below 21 which is the default "free" Fargate storage space.
         """
-        max_storage = max(service.ephemeral_storage for service in self.services)
-        return max_storage if max_storage >= 21 else 0
+        if self._task_ephemeral_storage is None:
+            max_storage = max(service.ephemeral_storage for service in self.services)
+            self._task_ephemeral_storage = max_storage if max_storage >= 21 else 0
+        return self._task_ephemeral_storage
 
     def set_enable_execute_command(self) -> None:
         """
         Sets necessary settings to enable ECS Execute Command
         ECS Anywhere support since 2022-01-24
         """
-        from .task_execute_command import set_enable_execute_command
-
         set_enable_execute_command(self)
 
     def apply_ecs_execute_command_permissions(self, settings: ComposeXSettings) -> None:
@@ -627,13 +669,9 @@ class ComposeFamily:
         :param settings:
         :return:
         """
-        from .task_execute_command import apply_ecs_execute_command_permissions
-
         apply_ecs_execute_command_permissions(self, settings)
 
     def handle_alarms(self) -> None:
-        from ecs_composex.ecs.service_alarms import handle_alarms
-
         handle_alarms(self)
 
     def handle_logging(self, settings: ComposeXSettings):
@@ -664,6 +702,7 @@ class ComposeFamily:
         handle_same_task_services_dependencies(service_configs)
         ordered_containers_config = sorted(service_configs, key=lambda i: i[0])
         self.ordered_services = [s[1] for s in ordered_containers_config]
+        self.reset_services()
         ensure_essential_containers(self)
 
     def set_secrets_access(self):
@@ -712,8 +751,6 @@ class ComposeFamily:
         """
         Checks for each service if `x-environment` was set
         """
-        from .family_helpers import swap_environment_value_with_parameter
-
         for service in self.ordered_services:
             if not service.x_environment:
                 continue
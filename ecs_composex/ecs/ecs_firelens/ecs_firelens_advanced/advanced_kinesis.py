@@ -10,11 +10,12 @@ if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
     from . import FireLensServiceManagedConfiguration
 
+from functools import cached_property
+
 from compose_x_common.aws.kinesis import KINESIS_STREAM_ARN_RE
-from compose_x_common.compose_x_common import keyisset
 from troposphere import Region
 
-from ecs_composex.compose.x_resources import ENV_VAR_NAME
+from ecs_composex.compose.x_resources import ENV_VAR_NAME, ENV_VAR_NAME_SEPARATORS
 from ecs_composex.ecs.ecs_firelens.firelens_options_generic_helpers import (
     handle_cross_account_permissions,
 )
@@ -24,22 +25,30 @@ from ecs_composex.ecs.ecs_firelens.helpers.kinesis_helpers import (
 from ecs_composex.kinesis.kinesis_params import STREAM_ARN
 from ecs_composex.kinesis.kinesis_stack import Stream
 
+MANAGED_STREAM_PREFIX: str = "x-kinesis"
+ARN_PREFIX: str = "arn:aws"
+REQUIRED_SETTINGS: tuple = (
+    "stream",
+    "region",
+)
+OPTIONS: tuple = (
+    "role_arn",
+    "time_key_format",
+    "time_key",
+    "log_key",
+    "compression",
+    "endpoint",
+    "sts_endpoint",
+    "auto_retry_requests",
+)
+OPTIONS_HANDLERS: dict = {
+    "role_arn": handle_cross_account_permissions,
+}
+
 
 class FireLensKinesisManagedDestination:
-    required = [
-        "stream",
-        "region",
-    ]
-    options = [
-        "role_arn",
-        "time_key_format",
-        "time_key",
-        "log_key",
-        "compression",
-        "endpoint",
-        "sts_endpoint",
-        "auto_retry_requests",
-    ]
+    required = REQUIRED_SETTINGS
+    options = OPTIONS
 
     def __init__(
         self,
@@ -49,10 +58,11 @@ class FireLensKinesisManagedDestination:
     ):
         self._definition = definition
         self.parent = advanced_config
-        if self._definition["stream"].startswith("x-kinesis"):
-            self._managed_data_stream = settings.find_resource(
-                self._definition["stream"]
-            )
+        self._arn_parts = None
+        self._managed_data_stream = None
+        stream: str = self._definition["stream"]
+        if stream.startswith(MANAGED_STREAM_PREFIX):
+            self._managed_data_stream = settings.find_resource(stream)
 
             add_data_stream_for_firelens(
                 self._managed_data_stream,
@@ -60,36 +70,28 @@ class FireLensKinesisManagedDestination:
                 self.parent.family,
                 settings,
             )
-        elif self._definition["stream"].startswith("arn:aws"):
-            self._managed_data_stream = None
-            parts = KINESIS_STREAM_ARN_RE.match(self._definition["stream"])
-            if parts:
+        elif stream.startswith(ARN_PREFIX):
+            self._arn_parts = KINESIS_STREAM_ARN_RE.match(stream)
+            if self._arn_parts:
                 self.parent.extra_env_vars.update(
-                    {self.delivery_stream_env_var_name: parts.group("id")}
+                    {self.delivery_stream_env_var_name: self._arn_parts.group("id")}
                 )
             else:
                 raise ValueError(
                     f"x-logging Kinesis Stream destination is not a valid ARN",
-                    {self._definition["stream"]},
+                    stream,
                     "must match",
                     KINESIS_STREAM_ARN_RE.pattern,
                 )
         else:
             self.parent.extra_env_vars.update(
-                {self.delivery_stream_env_var_name: self._definition["stream"]}
+                {self.delivery_stream_env_var_name: stream}
             )
         self.process_all_options(self.parent.family, self.parent.service, settings)
 
     def process_all_options(self, family, service, settings: ComposeXSettings):
-        param_to_handler = {
-            "role_arn": handle_cross_account_permissions,
-        }
-        for param_name, param_function in param_to_handler.items():
-            if (
-                param_name in self._definition.keys()
-                and param_function
-                and callable(param_function)
-            ):
+        for param_name, param_function in OPTIONS_HANDLERS.items():
+            if param_name in self._definition:
                 param_function(
                     family,
                     service,
@@ -98,37 +100,36 @@ class FireLensKinesisManagedDestination:
                     self._definition[param_name],
                 )
 
-    @property
+    @cached_property
     def delivery_stream(self) -> str:
         if isinstance(self._managed_data_stream, Stream):
             return self._managed_data_stream.name
-        parts = KINESIS_STREAM_ARN_RE.match(self._definition["delivery_stream"])
-        if parts:
-            return parts.group("id")
+        if self._arn_parts:
+            return self._arn_parts.group("id")
         else:
             raise ValueError(
                 f"Delivery stream neither a",
                 Stream,
                 "nor valid ARN",
-                parts,
+                self._definition["stream"],
                 KINESIS_STREAM_ARN_RE.pattern,
             )
 
-    @property
+    @cached_property
     def delivery_stream_env_var_name(self):
         if self._managed_data_stream:
             return self._managed_data_stream.env_var_prefix
         return ENV_VAR_NAME.sub(
-            "", self.delivery_stream.upper().replace("-", "_").replace(".", "_")
+            "", self.delivery_stream.upper().translate(ENV_VAR_NAME_SEPARATORS)
         )
 
-    @property
+    @cached_property
     def delivery_stream_fluent_env_var(self):
         if self._managed_data_stream:
             return rf"${{{self._managed_data_stream.env_var_prefix}}}"
         return rf"${{{self.delivery_stream_env_var_name}}}"
 
-    @property
+    @cached_property
     def region(self) -> str:
         if self._managed_data_stream:
             env_var_key = f"{self._managed_data_stream.env_var_prefix}_AWS_REGION"
@@ -138,16 +139,15 @@ class FireLensKinesisManagedDestination:
             elif self._managed_data_stream.mappings:
                 arn_value = self._managed_data_stream.mappings[STREAM_ARN.title]
                 return KINESIS_STREAM_ARN_RE.match(arn_value).group("region")
-        if keyisset("region", self._definition):
-            return self._definition["region"]
+        region = self._definition.get("region")
+        if region:
+            return region
         else:
             return r"${AWS_DEFAULT_REGION}"
 
     @property
     def is_cross_account(self) -> bool:
-        if keyisset("role_arn", self._definition):
-            return True
-        return False
+        return bool(self._definition.get("role_arn"))
 
     @property
     def output_definition(self):
@@ -155,7 +155,9 @@ class FireLensKinesisManagedDestination:
             "region": self.region,
             "stream": self.delivery_stream_fluent_env_var,
         }
-        for option_name in self.options:
-            if keyisset(option_name, self._definition):
-                config.update({option_name: self._definition[option_name]})
+        definition = self._definition
+        for option_name in OPTIONS:
+            option_value = definition.get(option_name)
+            if option_value:
+                config[option_name] = option_value
         return config
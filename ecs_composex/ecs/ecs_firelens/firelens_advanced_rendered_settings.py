@@ -30,20 +30,23 @@ def finalize_firelens_container_shorthands(
     config set not to overlap.
     """
     service_defined_firelens_options: dict = {}
+    ignored_services: list[str] = []
+    family_services = set(family.ordered_services)
     for _service, _svc_config in advanced_config.services_configs.items():
-        if _service not in family.ordered_services:
+        if _service not in family_services:
+            continue
+        _svc_options = set_else_none("Options", _svc_config.firelens_config, {})
+        if not _svc_options:
             continue
         if not service_defined_firelens_options:
-            service_defined_firelens_options: dict = set_else_none(
-                "Options", _svc_config.firelens_config, {}
-            )
+            service_defined_firelens_options = _svc_options
         else:
-            LOG.warning(
-                "{}.logging: FirelensConfiguration."
-                "Options already imported. Ignoring settings from {}".format(
-                    family.name, _service.name
-                )
-            )
+            ignored_services.append(_service.name)
+    if ignored_services:
+        LOG.warning(
+            f"{family.name}.logging: FirelensConfiguration.Options already imported. "
+            f"Ignoring settings from {', '.join(ignored_services)}"
+        )
 
     firelens_options: dict = {
         "config-file-value": f"{advanced_config.volume_mount}{advanced_config.config_file_name}",
@@ -69,16 +72,14 @@ def handle_firelens_advanced_settings(
 
     advanced_config = FireLensFamilyManagedConfiguration(family, settings)
     advanced_config.set_update_ssm_parameter(settings)
-    env_vars = [
-        Environment(Name=name, Value=str(value))
-        for name, value in advanced_config.extra_env_vars.items()
-        if isinstance(value, (int, float, str, bool))
-    ]
-    env_vars += [
-        Environment(Name=name, Value=value)
-        for name, value in advanced_config.extra_env_vars.items()
-        if isinstance(value, AWSHelperFn) or issubclass(type(value), AWSHelperFn)
-    ]
+    env_vars: list = []
+    functions_env_vars: list = []
+    for name, value in advanced_config.extra_env_vars.items():
+        if isinstance(value, (int, float, str, bool)):
+            env_vars.append(Environment(Name=name, Value=str(value)))
+        elif isinstance(value, AWSHelperFn):
+            functions_env_vars.append(Environment(Name=name, Value=value))
+    env_vars += functions_env_vars
     extend_container_envvars(
         family.logging.firelens_service.container_definition, env_vars
     )
@@ -17,14 +17,15 @@ if TYPE_CHECKING:
         ServiceSecurityGroup,
     )
     from ecs_composex.common.settings import ComposeXSettings
+    from troposphere import If, Template
     from troposphere.ecs import ServiceConnectConfiguration
 
+from functools import lru_cache
 from itertools import chain
 
 from compose_x_common.compose_x_common import keyisset, set_else_none
 from troposphere import (
     AWS_ACCOUNT_ID,
-    AWSHelperFn,
     FindInMap,
     GetAtt,
     NoValue,
@@ -48,6 +49,50 @@ from ecs_composex.ingress_settings import Ingress, set_service_ports
 from ecs_composex.vpc.vpc_params import APP_SUBNETS
 
 
+def add_security_group_to_groups(
+    security_group: SecurityGroup, groups: list, template: Template
+) -> None:
+    """Function to add the Ref to the security group if it is defined in the template"""
+    if security_group.title in template.resources:
+        groups.append(Ref(security_group))
+
+
+def add_parameter_to_groups(
+    parameter: Parameter, groups: list, template: Template
+) -> None:
+    """Function to add the security group parameter to the template, and its Ref to the groups"""
+    add_parameters(template, [parameter])
+    groups.append(Ref(parameter))
+
+
+def add_mapping_to_groups(mapping: FindInMap, groups: list, template: Template) -> None:
+    """Function to add the security group FindInMap to the groups"""
+    groups.append(mapping)
+
+
+EXTRA_SECURITY_GROUPS_HANDLERS = {
+    SecurityGroup: add_security_group_to_groups,
+    Parameter: add_parameter_to_groups,
+    FindInMap: add_mapping_to_groups,
+}
+
+
+@lru_cache(maxsize=None)
+def get_extra_security_group_handler(group_type: type):
+    """Function to get the handler for the type of extra security group, if any"""
+    handler = EXTRA_SECURITY_GROUPS_HANDLERS.get(group_type)
+    if handler is None:
+        handler = next(
+            (
+                _handler
+                for _type, _handler in EXTRA_SECURITY_GROUPS_HANDLERS.items()
+                if issubclass(group_type, _type)
+            ),
+            None,
+        )
+    return handler
+
+
 class ServiceNetworking:
     """
     Class to group the configuration for Service network settings
@@ -82,6 +127,7 @@ class ServiceNetworking:
         ]
         self.extra_security_groups = [self.security_group.parameter]
         self._subnets = Ref(APP_SUBNETS)
+        self._ecs_network_config: If | None = None
         self.cloudmap_config = (
             merge_cloudmap_settings(family, self.ports) if self.ports else {}
         )
@@ -96,18 +142,28 @@ class ServiceNetworking:
 
     @property
     def ecs_network_config(self):
+        """
+        The ECS Service NetworkConfiguration, built on first access.
+        Reset when the subnets change, use reset_network_config if the security groups change afterwards.
+        """
         if self.family.service_compute.launch_type == "EXTERNAL":
             return NoValue
-        return use_external_lt_con(
-            NoValue,
-            NetworkConfiguration(
-                AwsvpcConfiguration=AwsvpcConfiguration(
-                    Subnets=self.subnets,
-                    SecurityGroups=self.security_groups,
-                    AssignPublicIp=self.eip_assign,
-                )
-            ),
-        )
+        if self._ecs_network_config is None:
+            self._ecs_network_config = use_external_lt_con(
+                NoValue,
+                NetworkConfiguration(
+                    AwsvpcConfiguration=AwsvpcConfiguration(
+                        Subnets=self.subnets,
+                        SecurityGroups=self.security_groups,
+                        AssignPublicIp=self.eip_assign,
+                    )
+                ),
+            )
+        return self._ecs_network_config
+
+    def reset_network_config(self) -> None:
+        """Drops the NetworkConfiguration, for it to be re-evaluated on next access"""
+        self._ecs_network_config = None
 
     @property
     def sd_service(self):
@@ -129,7 +185,7 @@ class ServiceNetworking:
 
     @property
     def eip_assign(self):
-        if any([svc.eip_auto_assign for svc in self.family.ordered_services]):
+        if any(svc.eip_auto_assign for svc in self.family.ordered_services):
             LOG.info(
                 f"{self.family.name} - networking - "
                 "At least one service in definition has AssignPublicIp set to True."
@@ -140,17 +196,11 @@ class ServiceNetworking:
     @property
     def security_groups(self) -> list:
         groups = [Ref(self.security_group.parameter.title)]
+        template = self.family.template
         for extra_group in self.extra_security_groups:
-            if (
-                isinstance(extra_group, SecurityGroup)
-                and extra_group.title in self.family.template.resources
-            ):
-                groups.append(Ref(extra_group))
-            elif isinstance(extra_group, Parameter):
-                add_parameters(self.family.template, [extra_group])
-                groups.append(Ref(extra_group))
-            elif isinstance(extra_group, FindInMap):
-                groups.append(extra_group)
+            handler = get_extra_security_group_handler(type(extra_group))
+            if handler:
+                handler(extra_group, groups, template)
         return groups
 
     @property
@@ -184,11 +234,10 @@ class ServiceNetworking:
         Subnets value should only be a Ref on parameter or a CFN Function.
         If successful, auto updates the NetworkConfiguration for the family ecs_service
         """
-        if isinstance(value, Parameter):
-            self._subnets = Ref(Parameter)
-        elif issubclass(type(value), AWSHelperFn):
-            self._subnets = value
-        self._subnets = value
+        if value is self._subnets:
+            return
+        self._subnets = Ref(value) if isinstance(value, Parameter) else value
+        self.reset_network_config()
         if self.family.ecs_service and self.family.ecs_service.ecs_service:
             setattr(
                 self.family.ecs_service.ecs_service,
@@ -205,24 +254,22 @@ class ServiceNetworking:
                 self.networks.update(svc.networks)
 
     def merge_services_ports(self):
-        """Function to merge two sections of ports"""
-        source_ports = [
-            service.ports
-            for service in chain(
-                self.family.managed_sidecars, self.family.ordered_services
-            )
-            if service.ports
-        ]
-        for port_set in source_ports:
-            f_source_ports = set_service_ports(self.ports)
-            f_override_ports = set_service_ports(port_set)
-            self.ports = []
-            f_overide_ports_targets = [port["target"] for port in f_override_ports]
-            for port in f_override_ports:
-                self.ports.append(port)
-                for s_port in f_source_ports:
-                    if s_port["target"] not in f_overide_ports_targets:
-                        self.ports.append(s_port)
+        """
+        Function to merge the ports of all the family services.
+        The ports of a service override the ones with the same target port of the services before it.
+        """
+        merged_ports: list = set_service_ports(self.ports)
+        for service in chain(
+            self.family.managed_sidecars, self.family.ordered_services
+        ):
+            if not service.ports:
+                continue
+            override_ports: list = set_service_ports(service.ports)
+            override_targets: set = {port["target"] for port in override_ports}
+            merged_ports = override_ports + [
+                port for port in merged_ports if port["target"] not in override_targets
+            ]
+        self.ports = merged_ports
 
     def set_ecs_connect(self, settings: ComposeXSettings):
         self.ecs_connect_config = import_set_ecs_connect_settings(self.family, settings)
@@ -238,6 +285,10 @@ class ServiceNetworking:
             or not self.ingress_from_self
         ):
             return
+        template = self.family.template
+        to_self_rules = self.ingress.to_self_rules
+        security_group_ref = Ref(self.security_group.parameter)
+        account_id_ref = Ref(AWS_ACCOUNT_ID)
         for port in self.ports:
             target_port = set_else_none(
                 "published", port, alt_value=set_else_none("target", port, None)
@@ -246,20 +297,16 @@ class ServiceNetworking:
                 raise ValueError(
                     "Wrong port definition value for security group ingress", port
                 )
-            self.ingress.to_self_rules.append(
+            to_self_rules.append(
                 SecurityGroupIngress(
                     f"AllowingInterCommunicationPort{target_port}{port['protocol']}",
-                    template=self.family.template,
+                    template=template,
                     FromPort=target_port,
                     ToPort=target_port,
                     IpProtocol=port["protocol"],
-                    GroupId=Ref(
-                        self.family.service_networking.security_group.parameter
-                    ),
-                    SourceSecurityGroupId=Ref(
-                        self.family.service_networking.security_group.parameter
-                    ),
-                    SourceSecurityGroupOwnerId=Ref(AWS_ACCOUNT_ID),
+                    GroupId=security_group_ref,
+                    SourceSecurityGroupId=security_group_ref,
+                    SourceSecurityGroupOwnerId=account_id_ref,
                     Description=Sub(
                         f"Internal traffic on {target_port}/{port['protocol']}"
                     ),
@@ -274,25 +321,29 @@ class ServiceNetworking:
         :param lb_sg_ref:
         :return:
         """
-        if not self.family.template or not self.family.ecs_service:
+        template = self.family.template
+        if not template or not self.family.ecs_service:
             return
+        stack_title = self.family.stack.title
+        security_group_ref = Ref(self.security_group.parameter.title)
+        account_id_ref = Ref(AWS_ACCOUNT_ID)
         for port in self.ports:
-            title = f"FromLB{lb_name}To{self.family.stack.title}On{port['target']}"
+            title = f"FromLB{lb_name}To{stack_title}On{port['target']}"
             common_args = {
                 "FromPort": port["target"],
                 "ToPort": port["target"],
                 "IpProtocol": port["protocol"],
-                "GroupId": Ref(self.security_group.parameter.title),
-                "SourceSecurityGroupOwnerId": Ref(AWS_ACCOUNT_ID),
+                "GroupId": security_group_ref,
+                "SourceSecurityGroupOwnerId": account_id_ref,
                 "Description": Sub(
                     f"From ELB {lb_name} to ${{{SERVICE_NAME.title}}} on port {port['target']}"
                 ),
             }
-            if title in self.family.template.resources:
+            if title in template.resources:
                 return
             SecurityGroupIngress(
                 title,
-                template=self.family.template,
+                template=template,
                 SourceSecurityGroupId=lb_sg_ref,
                 **common_args,
             )
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
     from troposphere.applicationautoscaling import ScalableTarget
     from ecs_composex.compose.compose_services import ComposeService
 
-import secrets
+import random
 import string
 
 from compose_x_common.compose_x_common import keyisset, keypresent
@@ -25,6 +25,31 @@ from ecs_composex.common.logging import LOG
 from ecs_composex.common.troposphere_tools import add_resource
 from ecs_composex.ecs.ecs_params import SERVICE_SCALING_TARGET
 
+NO_VALUE_REF = Ref(AWS_NO_VALUE)
+SCALING_TARGET_REF = Ref(SERVICE_SCALING_TARGET)
+
+STEP_ALLOWED_KEYS = frozenset(("LowerBound", "UpperBound", "Count"))
+
+TRACKING_SETTINGS = {
+    "cpu": {
+        "key": "CpuTarget",
+        "property": "ECSServiceAverageCPUUtilization",
+    },
+    "memory": {
+        "key": "MemoryTarget",
+        "property": "ECSServiceAverageMemoryUtilization",
+    },
+    "targets": {
+        "key": "TgtTargetsCount",
+        "property": "ALBRequestCountPerTarget",
+    },
+}
+
+
+def _rand_suffix() -> str:
+    """Returns a random 6 characters suffix for the scaling policies names"""
+    return "".join(random.choices(string.ascii_lowercase, k=6))
+
 
 def validate_steps_definition(steps: list[dict], unordered: list[dict]) -> None:
     """
@@ -33,24 +58,21 @@ def validate_steps_definition(steps: list[dict], unordered: list[dict]) -> None:
     :param list steps: list of step definitions
     :param list unordered: list of steps, unordered.
     """
-    allowed_keys = ["LowerBound", "UpperBound", "Count"]
     for step_def in steps:
-        if not all(key in allowed_keys for key in step_def.keys()):
+        if not STEP_ALLOWED_KEYS.issuperset(step_def):
             raise KeyError(
                 "Step definition only allows",
-                allowed_keys,
+                sorted(STEP_ALLOWED_KEYS),
                 "Got",
                 step_def.keys(),
             )
-        if (
-            keyisset("UpperBound", step_def)
-            and step_def["LowerBound"] >= step_def["UpperBound"]
-        ):
+        upper_bound = step_def.get("UpperBound")
+        if upper_bound and step_def["LowerBound"] >= upper_bound:
             raise ValueError(
                 "The LowerBound value must strictly lower than the upper bound",
                 step_def,
             )
-        unordered.append(step_def)
+    unordered.extend(steps)
 
 
 def rectify_scaling_steps(cfn_steps: list[StepAdjustment]) -> None:
@@ -61,7 +83,7 @@ def rectify_scaling_steps(cfn_steps: list[StepAdjustment]) -> None:
         getattr(cfn_steps[-1], "MetricIntervalUpperBound"), Ref
     ):
         LOG.warning("The last upper bound shall not be set. Deleting value to comply}")
-        setattr(cfn_steps[-1], "MetricIntervalUpperBound", Ref(AWS_NO_VALUE))
+        setattr(cfn_steps[-1], "MetricIntervalUpperBound", NO_VALUE_REF)
 
 
 def define_step_adjustment(pre_upper: int, ordered: list, cfn_steps: list) -> None:
@@ -69,25 +91,24 @@ def define_step_adjustment(pre_upper: int, ordered: list, cfn_steps: list) -> No
     Creates the steps list for step scaling.
     """
     for step_def in ordered:
-        if pre_upper and not int(step_def["LowerBound"]) >= pre_upper:
+        lower_bound = int(step_def["LowerBound"])
+        upper_bound = step_def.get("UpperBound")
+        upper_bound = int(upper_bound) if upper_bound else None
+        if pre_upper and not lower_bound >= pre_upper:
             raise ValueError(
                 f"The value for lower bound is {step_def['LowerBound']},"
                 f"which is higher than the previous UpperBound, {pre_upper}"
             )
         cfn_steps.append(
             StepAdjustment(
-                MetricIntervalLowerBound=int(step_def["LowerBound"]),
+                MetricIntervalLowerBound=lower_bound,
                 MetricIntervalUpperBound=(
-                    int(step_def["UpperBound"])
-                    if keyisset("UpperBound", step_def)
-                    else Ref(AWS_NO_VALUE)
+                    upper_bound if upper_bound is not None else NO_VALUE_REF
                 ),
                 ScalingAdjustment=int(step_def["Count"]),
             )
         )
-        pre_upper = (
-            int(step_def["UpperBound"]) if keyisset("UpperBound", step_def) else None
-        )
+        pre_upper = upper_bound
 
 
 def generate_scaling_out_steps(
@@ -124,11 +145,8 @@ def generate_alarm_scaling_out_policy(
     if not keyisset("Steps", scaling_def):
         raise KeyError("No steps were defined in the scaling definition", scaling_def)
     steps_definition = scaling_def["Steps"]
-    length = 6
     if not scaling_source:
-        scaling_source = "".join(
-            secrets.choice(string.ascii_lowercase) for _ in range(length)
-        )
+        scaling_source = _rand_suffix()
     scalable_target = service_template.resources[SERVICE_SCALING_TARGET]
     step_adjustments = generate_scaling_out_steps(
         steps_definition, target=scalable_target
@@ -137,7 +155,7 @@ def generate_alarm_scaling_out_policy(
         f"ScalingOutPolicy{scaling_source}{service_name}",
         PolicyName=f"ScalingOutPolicy{scaling_source}{service_name}",
         PolicyType="StepScaling",
-        ScalingTargetId=Ref(SERVICE_SCALING_TARGET),
+        ScalingTargetId=SCALING_TARGET_REF,
         ServiceNamespace="ecs",
         StepScalingPolicyConfiguration=StepScalingPolicyConfiguration(
             AdjustmentType="ExactCapacity",
@@ -163,16 +181,13 @@ def reset_to_zero_policy(
     """
     Defines a policy allowing to reset to 0 containers.
     """
-    length = 6
     if not scaling_source:
-        scaling_source = "".join(
-            secrets.choice(string.ascii_lowercase) for _ in range(length)
-        )
+        scaling_source = _rand_suffix()
     policy = ScalingPolicy(
         f"ScalingInPolicy{scaling_source}{service_name}",
         PolicyName=f"ScalingInPolicy{scaling_source}{service_name}",
         PolicyType="StepScaling",
-        ScalingTargetId=Ref(SERVICE_SCALING_TARGET),
+        ScalingTargetId=SCALING_TARGET_REF,
         ServiceNamespace="ecs",
         StepScalingPolicyConfiguration=StepScalingPolicyConfiguration(
             AdjustmentType="ExactCapacity",
@@ -198,13 +213,16 @@ def handle_range(config: dict, key: str, new_range: str) -> None:
     """
     Function to handle Range.
     """
-    new_min = int(new_range.split("-")[0])
-    new_max = int(new_range.split("-")[1])
-    if not config[key]:
+    new_min, _, new_max = new_range.partition("-")
+    new_min, new_max = int(new_min), int(new_max)
+    current = config[key]
+    if not current:
         config[key] = {"min": new_min, "max": new_max}
     else:
-        config[key]["min"] = min(config[key]["min"], new_min)
-        config[key]["max"] = max(config[key]["max"], new_max)
+        if new_min < current["min"]:
+            current["min"] = new_min
+        if new_max > current["max"]:
+            current["max"] = new_max
 
 
 def handle_defined_target_scaling_props(
@@ -281,6 +299,13 @@ def handle_scheduled_actions(config: dict, config_name: str, definition: list) -
     config[config_name] = definition
 
 
+MERGE_DISPATCH = {
+    "Range": (str, handle_range),
+    "TargetScaling": (dict, handle_target_scaling),
+    "ScheduledActions": (list, handle_scheduled_actions),
+}
+
+
 def merge_family_services_scaling(services: list[ComposeService]) -> dict:
     x_scaling = {
         "Range": None,
@@ -293,19 +318,11 @@ def merge_family_services_scaling(services: list[ComposeService]) -> dict:
     x_scaling_configs = []
     for service in services:
         handle_defined_x_aws_autoscaling(x_scaling_configs, service)
-    valid_keys = [
-        ("Range", str, handle_range),
-        ("TargetScaling", dict, handle_target_scaling),
-        ("ScheduledActions", list, handle_scheduled_actions),
-    ]
-    for key in valid_keys:
-        for config in x_scaling_configs:
-            if (
-                keyisset(key[0], config)
-                and isinstance(config[key[0]], key[1])
-                and key[2]
-            ):
-                key[2](x_scaling, key[0], config[key[0]])
+    for config in x_scaling_configs:
+        for key, (key_type, handler) in MERGE_DISPATCH.items():
+            value = config.get(key)
+            if value and isinstance(value, key_type):
+                handler(x_scaling, key, value)
     return x_scaling
 
 
@@ -315,30 +332,19 @@ def define_tracking_target_configuration(
     """
     Function to create the configuration for target tracking scaling
     """
-    settings = {
-        "cpu": {
-            "key": "CpuTarget",
-            "property": "ECSServiceAverageCPUUtilization",
-        },
-        "memory": {
-            "key": "MemoryTarget",
-            "property": "ECSServiceAverageMemoryUtilization",
-        },
-        "targets": {
-            "key": "TgtTargetsCount",
-            "property": "ALBRequestCountPerTarget",
-        },
-    }
-    if config_key not in settings.keys():
-        raise KeyError(config_key, "Is invalid. Expected one of", settings.keys())
+    if config_key not in TRACKING_SETTINGS:
+        raise KeyError(
+            config_key, "Is invalid. Expected one of", tuple(TRACKING_SETTINGS)
+        )
+    settings = TRACKING_SETTINGS[config_key]
     specification = applicationautoscaling.PredefinedMetricSpecification(
-        PredefinedMetricType=settings[config_key]["property"]
+        PredefinedMetricType=settings["property"]
     )
 
     return applicationautoscaling.TargetTrackingScalingPolicyConfiguration(
         DisableScaleIn=target_scaling_config["DisableScaleIn"],
         ScaleInCooldown=target_scaling_config["ScaleInCooldown"],
         ScaleOutCooldown=target_scaling_config["ScaleOutCooldown"],
-        TargetValue=float(target_scaling_config[settings[config_key]["key"]]),
+        TargetValue=float(target_scaling_config[settings["key"]]),
         PredefinedMetricSpecification=specification,
     )
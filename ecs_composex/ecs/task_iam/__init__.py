@@ -10,6 +10,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from ecs_composex.compose.compose_services import ComposeService
     from ecs_composex.ecs.ecs_family import ComposeFamily
 
 from collections import OrderedDict
@@ -65,8 +66,12 @@ class TaskIam:
     def permissions_boundary(self, value):
         self._permissions_boundary = value
 
-    def init_update_policies(self):
-        for service in self.family.services:
+    def init_update_policies(self, services: list[ComposeService] = None):
+        """
+        Adds the x-iam managed policies, permissions boundary and policies of the services (defaults to all the
+        family services) to the family roles.
+        """
+        for service in services if services is not None else self.family.services:
             managed_policies = set_else_none("ManagedPolicyArns", service.x_iam, [])
             if managed_policies:
                 self.add_new_managed_policies(managed_policies)
@@ -7,6 +7,7 @@ RES_KEY = "x-cluster"
 FARGATE_PROVIDER = "FARGATE"
 FARGATE_SPOT_PROVIDER = "FARGATE_SPOT"
 FARGATE_PROVIDERS = [FARGATE_PROVIDER, FARGATE_SPOT_PROVIDER]
+FARGATE_PROVIDERS_SET = frozenset(FARGATE_PROVIDERS)
 DEFAULT_STRATEGY = [
     CapacityProviderStrategyItem(
         Weight=2, Base=1, CapacityProvider=FARGATE_SPOT_PROVIDER
@@ -13,7 +13,7 @@ if TYPE_CHECKING:
 from troposphere import NoValue
 
 from ecs_composex.ecs.ecs_params import LAUNCH_TYPE
-from ecs_composex.ecs_cluster import FARGATE_PROVIDERS
+from ecs_composex.ecs_cluster.ecs_cluster_params import FARGATE_PROVIDERS_SET
 from ecs_composex.ecs_composex import LOG
 
 """
@@ -43,7 +43,8 @@ def validate_capacity_providers(family: ComposeFamily, cluster: EcsCluster) -> b
     cap_names = [
         cap.CapacityProvider for cap in family.service_compute.ecs_capacity_providers
     ]
-    if not all(cap_name in FARGATE_PROVIDERS for cap_name in cap_names):
+    cap_set = set(cap_names)
+    if not cap_set.issubset(FARGATE_PROVIDERS_SET):
         raise ValueError(
             f"{family.name} - You cannot mix FARGATE capacity provider with AutoScaling Capacity Providers",
             cap_names,
@@ -51,7 +52,7 @@ def validate_capacity_providers(family: ComposeFamily, cluster: EcsCluster) -> b
     if not isinstance(cluster.capacity_providers, list):
         raise TypeError("clusters_providers must be a list")
 
-    elif not all(provider in cluster.capacity_providers for provider in cap_names):
+    elif not cap_set.issubset(cluster.capacity_providers):
         raise ValueError(
             "Providers",
             cap_names,
@@ -112,13 +113,12 @@ def set_launch_type_from_cluster_and_service(
     family_providers: list = [
         cap.CapacityProvider for cap in family.service_compute.ecs_capacity_providers
     ]
-    family_uses_fargate_only = all(
-        provider in FARGATE_PROVIDERS for provider in family_providers
+    family_providers_set = set(family_providers)
+    family_uses_fargate_only = family_providers_set.issubset(FARGATE_PROVIDERS_SET)
+    cluster_uses_fargate_only = FARGATE_PROVIDERS_SET.issuperset(
+        cluster.capacity_providers
     )
-    cluster_uses_fargate_only = all(
-        provider in FARGATE_PROVIDERS for provider in cluster.capacity_providers
-    )
-    if not all(provider in cluster.capacity_providers for provider in family_providers):
+    if not family_providers_set.issubset(cluster.capacity_providers):
         raise AttributeError(
             "Family {} tries to use providers not available in the cluster. "
             "Wants: {}. Available: {}".format(
@@ -131,10 +131,7 @@ def set_launch_type_from_cluster_and_service(
         family.service_compute.launch_type = "SERVICE_MODE"
         LOG.info(
             f"{family.name} - Using AutoScaling Based Providers",
-            [
-                provider.CapacityProvider
-                for provider in family.service_compute.ecs_capacity_providers
-            ],
+            family_providers,
         )
 
 
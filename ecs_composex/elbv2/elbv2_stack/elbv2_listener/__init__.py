@@ -10,14 +10,13 @@ if TYPE_CHECKING:
     from ecs_composex.elbv2.elbv2_ecs import MergedTargetGroup
 
 import warnings
-from copy import deepcopy
 
 from compose_x_common.compose_x_common import keyisset
 from troposphere import Ref
 from troposphere.cognito import UserPoolClient
 from troposphere.elasticloadbalancingv2 import Listener
 
-from ecs_composex.common import NONALPHANUM
+from ecs_composex.common import sanitize_name
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.troposphere_tools import add_parameters
 from ecs_composex.elbv2.elbv2_params import LB_ARN
@@ -25,19 +24,39 @@ from ecs_composex.elbv2.elbv2_stack.helpers import (
     add_acm_certs_arn,
     define_actions,
     define_listener_rules_actions,
+    get_cognito_pool_domain,
     handle_default_actions,
     handle_non_default_services,
     import_cognito_pool,
     import_new_acm_certs,
+    index_lb_target_groups,
     map_service_target,
     tea_pot,
     validate_duplicate_targets,
 )
 from ecs_composex.resources_import import import_record_properties
 
+CERTIFICATE_SOURCES = {
+    "x-acm": import_new_acm_certs,
+    "Arn": add_acm_certs_arn,
+    "CertificateArn": add_acm_certs_arn,
+}
+
+
+def _fast_clone(obj):
+    """
+    Copies the dict/list containers of a listener definition loaded from YAML.
+    Any other value is immutable and returned as-is, which avoids the memo of deepcopy.
+    """
+    if type(obj) is dict:
+        return {key: _fast_clone(value) for key, value in obj.items()}
+    if type(obj) is list:
+        return [_fast_clone(value) for value in obj]
+    return obj
+
 
 class ComposeListener(Listener):
-    attributes = [
+    attributes = (
         "Condition",
         "CreationPolicy",
         "DeletionPolicy",
@@ -45,9 +64,11 @@ class ComposeListener(Listener):
         "Metadata",
         "UpdatePolicy",
         "UpdateReplacePolicy",
-    ]
+    )
 
     targets_keys = "Targets"
+    straight_import_keys = ("Protocol", "SslPolicy", "AlpnPolicy")
+    listener_import_keys = straight_import_keys + attributes
 
     def __init__(self, lb: Elbv2, port: int, definition: dict):
         """
@@ -58,48 +79,33 @@ class ComposeListener(Listener):
         """
         self._lb = lb
         self._port: int = port
-        self.definition = deepcopy(definition)
-        straight_import_keys = ["Protocol", "SslPolicy", "AlpnPolicy"]
+        self.definition = _fast_clone(definition)
         listener_kwargs = {
-            x: self.definition[x] for x in straight_import_keys if x in self.definition
+            x: self.definition[x]
+            for x in self.listener_import_keys
+            if x in self.definition
         }
-        listener_kwargs.update(
-            {x: self.definition[x] for x in self.attributes if x in self.definition}
-        )
-        listener_kwargs.update({"Port": port})
-        self.services = (
-            self.definition[self.targets_keys]
-            if keyisset(self.targets_keys, self.definition)
-            and isinstance(self.definition[self.targets_keys], list)
-            else []
-        )
-        self.default_actions = (
-            self.definition["DefaultActions"]
-            if keyisset("DefaultActions", self.definition)
-            else []
-        )
+        listener_kwargs["Port"] = port
+        targets = self.definition.get(self.targets_keys)
+        self.services = targets if targets and isinstance(targets, list) else []
+        self._services_by_name: dict = {}
+        for _service in self.services:
+            self._services_by_name.setdefault(_service["name"], _service)
+        self.default_actions = self.definition.get("DefaultActions") or []
         if lb.cfn_resource:
-            listener_kwargs.update({"LoadBalancerArn": Ref(lb.lb)})
+            listener_kwargs["LoadBalancerArn"] = Ref(lb.lb)
         else:
-            add_parameters(
-                lb.stack.stack_template,
-                [lb.attributes_outputs[LB_ARN]["ImportParameter"]],
-            )
-            listener_kwargs.update(
-                {
-                    "LoadBalancerArn": Ref(
-                        lb.attributes_outputs[LB_ARN]["ImportParameter"]
-                    )
-                }
-            )
-            lb.stack.Parameters.update(
-                {
-                    lb.attributes_outputs[LB_ARN][
-                        "ImportParameter"
-                    ].title: lb.attributes_outputs[LB_ARN]["ImportValue"]
-                }
-            )
-        self.name = f"{lb.logical_name}{listener_kwargs['Port']}"
+            lb_arn_attribute = lb.attributes_outputs[LB_ARN]
+            import_parameter = lb_arn_attribute["ImportParameter"]
+            import_title = import_parameter.title
+            if (
+                import_title not in lb.stack.stack_template.parameters
+                or import_title not in lb.stack.Parameters
+            ):
+                add_parameters(lb.stack.stack_template, [import_parameter])
+                lb.stack.Parameters[import_title] = lb_arn_attribute["ImportValue"]
+            listener_kwargs["LoadBalancerArn"] = Ref(import_parameter)
+        self.name = f"{lb.logical_name}{port}"
         super().__init__(self.name, **listener_kwargs)
         self.DefaultActions = []
 
@@ -118,37 +124,37 @@ class ComposeListener(Listener):
         If not defined and there is only one service defined, it will skip
         """
         rules: list = []
-        if not self.default_actions and not self.services:
+        services = self.services
+        if self.default_actions:
+            handle_default_actions(self)
+        elif not services:
             warnings.warn(
                 f"{self.name} - There are no actions defined or services for listener {self.title}. Skipping"
             )
             return
-        if self.default_actions:
-            handle_default_actions(self)
-        elif not self.default_actions and self.services and len(self.services) == 1:
-            if not keyisset("Conditions", self.services[0]):
+        elif len(services) == 1:
+            if not keyisset("Conditions", services[0]):
                 LOG.info(
-                    f"{self.title} has no defined DefaultActions and only 1 service "
-                    "without Conditions. Setting Listener DefaultActions to service."
+                    "%s has no defined DefaultActions and only 1 service "
+                    "without Conditions. Setting Listener DefaultActions to service.",
+                    self.title,
                 )
-                self.DefaultActions = define_actions(self, self.services[0])
+                self.DefaultActions = define_actions(self, services[0])
             else:
                 self.DefaultActions = [tea_pot(True)]
-                rules = define_listener_rules_actions(self, self.services)
-        elif lb.is_nlb() and self.services and len(self.services) > 1:
+                rules = define_listener_rules_actions(self, services)
+        elif lb.is_nlb():
             raise ValueError(
                 f"{lb.module.res_key}.{lb.name} - Listener {self.def_port}"
                 " - NLB cannot have more than one target per listener."
             )
-        elif not self.default_actions and self.services and len(self.services) > 1:
+        else:
             LOG.warning(
                 f"{self.title} - "
                 "No default actions defined and more than one service defined. "
                 "If one of the access path is / it will be used as default"
             )
             rules = handle_non_default_services(self)
-        else:
-            raise ValueError(f"Failed to determine any default action for {self.title}")
         if rules and lb.is_alb():
             for rule in rules:
                 template.add_resource(rule)
@@ -165,51 +171,64 @@ class ComposeListener(Listener):
         :return:
         """
         cognito_auth_key = "AuthenticateCognitoConfig"
+        imported_pools: dict = {}
+
+        def get_pool_params(pool_id: str) -> tuple:
+            if pool_id not in imported_pools:
+                imported_pools[pool_id] = import_cognito_pool(
+                    pool_id, settings, listener_stack
+                )
+            return imported_pools[pool_id]
+
         for target in self.services:
-            if keyisset("CreateCognitoClient", target):
-                user_pool_client_params = target["CreateCognitoClient"]
+            user_pool_client_params = target.get("CreateCognitoClient")
+            cognito_auth_config = target.get(cognito_auth_key)
+            if user_pool_client_params:
                 pool_id = user_pool_client_params["UserPoolId"]
-                pool_params = import_cognito_pool(pool_id, settings, listener_stack)
+                pool_params = get_pool_params(pool_id)
                 user_pool_client_params["UserPoolId"] = pool_params[0]
                 user_pool_client_props = import_record_properties(
                     user_pool_client_params, UserPoolClient
                 )
                 user_pool_client = listener_stack.stack_template.add_resource(
                     UserPoolClient(
-                        f"{listener_stack.title}UserPoolClient{NONALPHANUM.sub('', target['name'])}",
+                        f"{listener_stack.title}UserPoolClient{sanitize_name(target['name'])}",
                         **user_pool_client_props,
                     )
                 )
-                if keyisset(cognito_auth_key, target):
-                    target[cognito_auth_key]["UserPoolArn"] = pool_params[1]
-                    target[cognito_auth_key]["UserPoolDomain"] = pool_params[2]
-                    target[cognito_auth_key]["UserPoolClientId"] = Ref(user_pool_client)
+                pool_settings = {
+                    "UserPoolArn": pool_params[1],
+                    "UserPoolDomain": get_cognito_pool_domain(
+                        pool_params, cognito_auth_config, pool_id
+                    ),
+                    "UserPoolClientId": Ref(user_pool_client),
+                }
+                if cognito_auth_config:
+                    cognito_auth_config.update(pool_settings)
                 else:
                     LOG.warning(
                         "No AuthenticateCognitoConfig defined. Setting to default settings"
                     )
-                    target.update(
-                        {
-                            cognito_auth_key: {
-                                "OnUnauthenticatedRequest": "authenticate",
-                                "Scope": "openid email profile",
-                                "UserPoolArn": pool_params[1],
-                                "UserPoolDomain": pool_params[2],
-                                "UserPoolClientId": Ref(user_pool_client),
-                            }
-                        }
-                    )
-                del target["CreateCognitoClient"]
-            elif (
-                not keyisset("CreateCognitoClient", target)
-                and keyisset(cognito_auth_key, target)
-                and keyisset("UserPoolArn", target[cognito_auth_key])
-                and target[cognito_auth_key]["UserPoolArn"].startswith("x-cognito")
-            ):
-                pool_id = target[cognito_auth_key]["UserPoolArn"].split(r"::")[-1]
-                pool_params = import_cognito_pool(pool_id, settings, listener_stack)
-                target[cognito_auth_key]["UserPoolArn"] = pool_params[1]
-                target[cognito_auth_key]["UserPoolDomain"] = pool_params[2]
+                    target[cognito_auth_key] = {
+                        "OnUnauthenticatedRequest": "authenticate",
+                        "Scope": "openid email profile",
+                        **pool_settings,
+                    }
+                target.pop("CreateCognitoClient")
+            elif cognito_auth_config:
+                pool_arn = cognito_auth_config.get("UserPoolArn")
+                if not pool_arn or not pool_arn.startswith("x-cognito"):
+                    continue
+                pool_id = pool_arn.split(r"::")[-1]
+                pool_params = get_pool_params(pool_id)
+                cognito_auth_config.update(
+                    {
+                        "UserPoolArn": pool_params[1],
+                        "UserPoolDomain": get_cognito_pool_domain(
+                            pool_params, cognito_auth_config, pool_id
+                        ),
+                    }
+                )
 
     def handle_certificates(self, settings, listener_stack):
         """
@@ -223,22 +242,13 @@ class ComposeListener(Listener):
         if not keyisset("Certificates", self.definition):
             LOG.warning(f"No certificates defined for Listener {self.name}")
             return
-        valid_sources = [
-            ("x-acm", str, import_new_acm_certs),
-            ("Arn", str, add_acm_certs_arn),
-            ("CertificateArn", str, add_acm_certs_arn),
-        ]
         for cert_def in self.definition["Certificates"]:
-            if isinstance(cert_def, dict):
-                cert_source = list(cert_def.keys())[0]
-                source_value = cert_def[cert_source]
-                for src_type in valid_sources:
-                    if (
-                        src_type[0] == cert_source
-                        and isinstance(cert_source, src_type[1])
-                        and src_type[2]
-                    ):
-                        src_type[2](self, source_value, settings, listener_stack)
+            if not cert_def or not isinstance(cert_def, dict):
+                continue
+            cert_source, source_value = next(iter(cert_def.items()))
+            handler = CERTIFICATE_SOURCES.get(cert_source)
+            if handler and isinstance(source_value, str):
+                handler(self, source_value, settings, listener_stack)
 
     def map_lb_target_groups_service_to_listener_targets(self, lb: Elbv2) -> None:
         """
@@ -247,8 +257,9 @@ class ComposeListener(Listener):
         if not self.services:
             return
         validate_duplicate_targets(lb, self)
+        target_groups_index = index_lb_target_groups(lb)
         for l_service_def in self.services:
-            map_service_target(lb, l_service_def)
+            map_service_target(lb, l_service_def, target_groups_index)
             if not keyisset("target_arn", l_service_def):
                 raise LookupError(
                     f"{lb.module.res_key}.{lb.name} - Listener {self.name}",
@@ -261,12 +272,13 @@ class ComposeListener(Listener):
                 f"{self.lb.module.res_key}.{self.lb.name} - Listener {self.Port} - No Targets defined."
             )
             return
-        for _tgt_group in self.services:
-            _tgt_name = _tgt_group["name"]
-            if _tgt_name == target_group.name:
-                _tgt_group["target_arn"] = Ref(target_group)
-                break
+        _tgt_group = self._services_by_name.get(target_group.name)
+        if _tgt_group is not None:
+            _tgt_group["target_arn"] = Ref(target_group)
         else:
             LOG.debug(
-                f"{self.lb.module.res_key}.{self.lb.name} - Listener {self.Port} - No target group matched."
+                "%s.%s - Listener %s - No target group matched.",
+                self.lb.module.res_key,
+                self.lb.name,
+                self.Port,
             )
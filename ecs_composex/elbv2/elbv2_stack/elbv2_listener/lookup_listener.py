@@ -16,14 +16,16 @@ from troposphere import Ref
 from troposphere.cognito import UserPoolClient
 from troposphere.elasticloadbalancingv2 import ListenerRule
 
-from ecs_composex.common import NONALPHANUM
+from ecs_composex.common import sanitize_name
 from ecs_composex.common.aws import find_aws_resource_arn_from_tags_api
 from ecs_composex.common.logging import LOG
 from ecs_composex.elbv2.elbv2_stack.helpers import (
     LISTENER_TARGET_RE,
     define_actions,
     define_target_conditions,
+    get_cognito_pool_domain,
     import_cognito_pool,
+    index_lb_target_groups,
     map_service_target,
     validate_duplicate_targets,
 )
@@ -158,13 +160,16 @@ class LookupListener:
                 )
                 user_pool_client = listener_stack.stack_template.add_resource(
                     UserPoolClient(
-                        f"{listener_stack.title}UserPoolClient{NONALPHANUM.sub('', target['name'])}",
+                        f"{listener_stack.title}UserPoolClient{sanitize_name(target['name'])}",
                         **user_pool_client_props,
                     )
                 )
+                pool_domain = get_cognito_pool_domain(
+                    pool_params, target.get(cognito_auth_key), pool_id
+                )
                 if keyisset(cognito_auth_key, target):
                     target[cognito_auth_key]["UserPoolArn"] = pool_params[1]
-                    target[cognito_auth_key]["UserPoolDomain"] = pool_params[2]
+                    target[cognito_auth_key]["UserPoolDomain"] = pool_domain
                     target[cognito_auth_key]["UserPoolClientId"] = Ref(user_pool_client)
                 else:
                     LOG.warning(
@@ -176,7 +181,7 @@ class LookupListener:
                                 "OnUnauthenticatedRequest": "authenticate",
                                 "Scope": "openid email profile",
                                 "UserPoolArn": pool_params[1],
-                                "UserPoolDomain": pool_params[2],
+                                "UserPoolDomain": pool_domain,
                                 "UserPoolClientId": Ref(user_pool_client),
                             }
                         }
@@ -191,7 +196,9 @@ class LookupListener:
                 pool_id = target[cognito_auth_key]["UserPoolArn"].split(r"::")[-1]
                 pool_params = import_cognito_pool(pool_id, settings, listener_stack)
                 target[cognito_auth_key]["UserPoolArn"] = pool_params[1]
-                target[cognito_auth_key]["UserPoolDomain"] = pool_params[2]
+                target[cognito_auth_key]["UserPoolDomain"] = get_cognito_pool_domain(
+                    pool_params, target[cognito_auth_key], pool_id
+                )
 
     def map_lb_target_groups_service_to_listener_targets(self, lb: Elbv2) -> None:
         """
@@ -200,8 +207,9 @@ class LookupListener:
         if not self.services:
             return
         validate_duplicate_targets(lb, self)
+        target_groups_index = index_lb_target_groups(lb)
         for l_service_def in self.services:
-            map_service_target(lb, l_service_def)
+            map_service_target(lb, l_service_def, target_groups_index)
             if not keyisset("target_arn", l_service_def):
                 raise LookupError(
                     f"{lb.module.res_key}.{lb.name} - Listener {self.arn}",
@@ -242,7 +250,7 @@ class LookupListener:
         for count, service_def in enumerate(self.services):
             priority = offset - count - 1
             rule = ListenerRule(
-                f"{NONALPHANUM.sub('', listener_id)}{NONALPHANUM.sub('', service_def['name'])}Rule{count}",
+                f"{sanitize_name(listener_id)}{sanitize_name(service_def['name'])}Rule{count}",
                 ListenerArn=self.arn,
                 Actions=define_actions(self, service_def, True),
                 Priority=priority,
@@ -14,11 +14,10 @@ if TYPE_CHECKING:
     from ecs_composex.elbv2.elbv2_stack import Elbv2
 
 import re
-from copy import deepcopy
 from json import dumps
 
-from compose_x_common.compose_x_common import keyisset, set_else_none
-from troposphere import AWS_NO_VALUE, FindInMap, Ref
+from compose_x_common.compose_x_common import keyisset
+from troposphere import AWS_NO_VALUE, FindInMap, GetAtt, Ref
 from troposphere.elasticloadbalancingv2 import (
     Action,
     AuthenticateCognitoConfig,
@@ -46,7 +45,7 @@ from ecs_composex.cognito_userpool.cognito_params import (
     USERPOOL_DOMAIN,
     USERPOOL_ID,
 )
-from ecs_composex.common import NONALPHANUM
+from ecs_composex.common import sanitize_name
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.troposphere_tools import (
     Parameter,
@@ -59,6 +58,17 @@ from ecs_composex.resources_import import import_record_properties
 LISTENER_TARGET_RE: re.Pattern = re.compile(
     r"(?P<family>[\w\-]+):(?P<container>[\w\-]+)(?::(?P<port>[\d]{1,5}))?"
 )
+DOMAIN_PATH_RE: re.Pattern = re.compile(
+    r"^((?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(?:\.[A-Za-z0-9\-]{1,63})*\.?(?<!-))(?::[0-9]{1,5})?(/[\S]+$)"
+)
+DOMAIN_RE: re.Pattern = re.compile(
+    r"^(?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(\.[A-Za-z0-9\-]{1,63})*\.?(?<!-)$"
+)
+PATH_RE: re.Pattern = re.compile(r"(^/[\S]+$)")
+CERT_ARN_RE: re.Pattern = re.compile(
+    r"((?:^arn:aws(?:-[a-z]+)?:acm:[\S]+:[0-9]+:certificate/)"
+    r"([a-z0-9]{8}(?:-[a-z0-9]{4}){3}-[a-z0-9]{12})$)"
+)
 
 
 def handle_cross_zone(value: str) -> LoadBalancerAttributes:
@@ -125,10 +135,15 @@ def validate_listeners_duplicates(name, ports) -> None:
     :param ports:
     :return:
     """
-    if len(ports) != len(set(ports)):
-        raise ValueError(
-            f"{name} - More than one listener with port {{x for x in ports if x in s or s.add(x)}}"
-        )
+    seen_ports: set = set()
+    duplicate_ports: set = set()
+    for port in ports:
+        if port in seen_ports:
+            duplicate_ports.add(port)
+        else:
+            seen_ports.add(port)
+    if duplicate_ports:
+        raise ValueError(f"{name} - More than one listener with port {duplicate_ports}")
 
 
 def add_listener_certificate_via_arn(
@@ -147,7 +162,7 @@ def add_listener_certificate_via_arn(
     """
     listener_stack.stack_template.add_resource(
         ListenerCertificate(
-            f"AcmCert{listener.title}{NONALPHANUM.sub('', cert_name)}",
+            f"AcmCert{listener.title}{sanitize_name(cert_name)}",
             Certificates=[Certificate(CertificateArn=certificate_arn_id)],
             ListenerArn=Ref(listener),
         )
@@ -187,41 +202,41 @@ def tea_pot(default_of_all=False) -> Action:
     )
 
 
+PREDEFINED_REDIRECTS = {
+    "HTTP_TO_HTTPS": http_to_https_default,
+    "TEA_POT": tea_pot,
+}
+
+
 def handle_predefined_redirects(listener: ComposeListener, action_name) -> None:
     """
     Function to handle predefined redirects
     """
-    predefined_redirects = [
-        ("HTTP_TO_HTTPS", http_to_https_default),
-        ("TEA_POT", tea_pot),
-    ]
-    if action_name not in [r[0] for r in predefined_redirects]:
+    redirect_function = PREDEFINED_REDIRECTS.get(action_name)
+    if redirect_function is None:
         raise ValueError(
             f"Redirect {action_name} is not a valid pre-defined setting. Valid values",
-            [r[0] for r in predefined_redirects],
+            list(PREDEFINED_REDIRECTS),
         )
-    for redirect_key, redirect_function in predefined_redirects:
-        if action_name == redirect_key:
-            action = redirect_function()
-            listener.DefaultActions.insert(0, action)
+    listener.DefaultActions.insert(0, redirect_function())
+
+
+DEFAULT_ACTIONS_SOURCES = {"Redirect": handle_predefined_redirects}
 
 
 def handle_default_actions(listener: ComposeListener) -> None:
     """
     Handles default actions set on the listener
     """
-    action_sources = [("Redirect", handle_predefined_redirects)]
     for action_def in listener.default_actions:
-        action_source = list(action_def.keys())[0]
-        source_value = action_def[action_source]
-        if action_source not in [a[0] for a in action_sources]:
+        action_source, source_value = next(iter(action_def.items()))
+        action_function = DEFAULT_ACTIONS_SOURCES.get(action_source)
+        if action_function is None:
             raise KeyError(
                 f"Action {action_source} is not supported. Supported actions",
-                [a[0] for a in action_sources],
+                list(DEFAULT_ACTIONS_SOURCES),
             )
-        for action in action_sources:
-            if action_source == action[0]:
-                action[1](listener, source_value)
+        action_function(listener, source_value)
 
 
 def handle_string_condition_format(access_string) -> list:
@@ -235,39 +250,30 @@ def handle_string_condition_format(access_string) -> list:
     :param access_string:
     :return:
     """
-    domain_path_re = re.compile(
-        r"^((?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(?:\.[A-Za-z0-9\-]{1,63})*\.?(?<!-))(?::[0-9]{1,5})?(/[\S]+$)"
-    )
-    domain_re = re.compile(
-        r"^(?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(\.[A-Za-z0-9\-]{1,63})*\.?(?<!-)$"
-    )
-    path_re = re.compile(r"(^/[\S]+$)")
-    if (
-        domain_path_re.match(access_string)
-        and len(domain_path_re.match(access_string).groups()) == 2
-    ):
+    domain_path_parts = DOMAIN_PATH_RE.match(access_string)
+    if domain_path_parts and len(domain_path_parts.groups()) == 2:
         return [
             Condition(
                 Field="host-header",
                 HostHeaderConfig=HostHeaderConfig(
-                    Values=[domain_path_re.match(access_string).groups()[0]],
+                    Values=[domain_path_parts.group(1)],
                 ),
             ),
             Condition(
                 Field="path-pattern",
                 PathPatternConfig=PathPatternConfig(
-                    Values=[domain_path_re.match(access_string).groups()[1]]
+                    Values=[domain_path_parts.group(2)]
                 ),
             ),
         ]
-    elif domain_re.match(access_string):
+    elif DOMAIN_RE.match(access_string):
         return [
             Condition(
                 Field="host-header",
                 HostHeaderConfig=HostHeaderConfig(Values=[access_string]),
             )
         ]
-    elif path_re.match(access_string):
+    elif PATH_RE.match(access_string):
         return [
             Condition(
                 Field="path-pattern",
@@ -287,7 +293,8 @@ def define_target_conditions(definition: dict) -> list:
     :rtype: list
     """
     conditions = []
-    user_defined_conditions = set_else_none("Conditions", definition, [])
+    user_defined_conditions = definition.get("Conditions")
+    access = definition.get("access")
     if user_defined_conditions:
         if not isinstance(user_defined_conditions, list):
             raise TypeError(
@@ -301,11 +308,38 @@ def define_target_conditions(definition: dict) -> list:
             set_to_novalue=False,
             ignore_missing_required=True,
         )["Conditions"]
-    elif keyisset("access", definition) and isinstance(definition["access"], str):
-        return handle_string_condition_format(definition["access"])
+    elif access and isinstance(access, str):
+        return handle_string_condition_format(access)
     return conditions
 
 
+AUTH_CONFIGS_PROPERTIES: dict = {}
+AUTH_CONFIGS_PROPERTIES_MAX_SIZE = 1000
+
+
+def _serialize_auth_config_value(value):
+    return value.to_dict() if hasattr(value, "to_dict") else str(value)
+
+
+def import_auth_config_properties(config: dict, config_class) -> dict:
+    """
+    Caches the imported properties of the Cognito/OIDC authentication configs, commonly shared
+    by the targets of the listeners.
+    The returned dict is only used to build new config objects and must not be modified.
+    """
+    cache_key = (
+        config_class.__name__,
+        dumps(config, sort_keys=True, default=_serialize_auth_config_value),
+    )
+    if cache_key not in AUTH_CONFIGS_PROPERTIES:
+        if len(AUTH_CONFIGS_PROPERTIES) >= AUTH_CONFIGS_PROPERTIES_MAX_SIZE:
+            del AUTH_CONFIGS_PROPERTIES[next(iter(AUTH_CONFIGS_PROPERTIES))]
+        AUTH_CONFIGS_PROPERTIES[cache_key] = import_record_properties(
+            config, config_class
+        )
+    return AUTH_CONFIGS_PROPERTIES[cache_key]
+
+
 def define_actions(listener, target_def, rule_actions: bool = False) -> list:
     """
     Function to identify the Target definition and create the resulting rule appropriately.
@@ -322,7 +356,7 @@ def define_actions(listener, target_def, rule_actions: bool = False) -> list:
     actions = []
     if keyisset("AuthenticateCognitoConfig", target_def):
         auth_action_type = "authenticate-cognito"
-        props = import_record_properties(
+        props = import_auth_config_properties(
             target_def["AuthenticateCognitoConfig"], AuthenticateCognitoConfig
         )
         auth_rule = AuthenticateCognitoConfig(**props)
@@ -331,7 +365,7 @@ def define_actions(listener, target_def, rule_actions: bool = False) -> list:
         )
     elif keyisset("AuthenticateOidcConfig", target_def):
         auth_action_type = "authenticate-oidc"
-        props = import_record_properties(
+        props = import_auth_config_properties(
             target_def["AuthenticateOidcConfig"], AuthenticateOidcConfig
         )
         auth_rule = AuthenticateOidcConfig(**props)
@@ -351,29 +385,15 @@ def define_actions(listener, target_def, rule_actions: bool = False) -> list:
                 listener.Protocol,
             )
         actions.append(auth_action)
-        actions.append(
-            action_class(
-                Type="forward",
-                ForwardConfig=ForwardConfig(
-                    TargetGroups=[
-                        TargetGroupTuple(TargetGroupArn=target_def["target_arn"])
-                    ]
-                ),
-                Order=2,
-            )
-        )
-    else:
-        actions.append(
-            action_class(
-                Type="forward",
-                ForwardConfig=ForwardConfig(
-                    TargetGroups=[
-                        TargetGroupTuple(TargetGroupArn=target_def["target_arn"])
-                    ]
-                ),
-                Order=1,
-            )
+    actions.append(
+        action_class(
+            Type="forward",
+            ForwardConfig=ForwardConfig(
+                TargetGroups=[TargetGroupTuple(TargetGroupArn=target_def["target_arn"])]
+            ),
+            Order=2 if auth_action else 1,
         )
+    )
     return actions
 
 
@@ -388,7 +408,7 @@ def define_listener_rules_actions(
     for count, service_def in enumerate(left_services):
         priority = count + 1 + offset
         rule = ListenerRule(
-            f"{listener.title}{NONALPHANUM.sub('', service_def['name'])}Rule{count}",
+            f"{listener.title}{sanitize_name(service_def['name'])}Rule{count}",
             ListenerArn=Ref(listener),
             Actions=define_actions(listener, service_def, True),
             Priority=priority,
@@ -402,15 +422,15 @@ def handle_non_default_services(listener: ComposeListener) -> list:
     """
     Function to handle define the listener rule and identify
     """
-    left_services = deepcopy(listener.services)
-    for count, service_def in enumerate(listener.services):
-        if (
-            isinstance(service_def.get("access", None), str)
-            and service_def["access"] == "/"
-        ):
-            left_services.pop(count)
-            listener.DefaultActions += define_actions(listener, service_def)
-            break
+    default_service = None
+    left_services = []
+    for service_def in listener.services:
+        if default_service is None and service_def.get("access", None) == "/":
+            default_service = service_def
+        else:
+            left_services.append(service_def)
+    if default_service is not None:
+        listener.DefaultActions += define_actions(listener, default_service)
     else:
         LOG.warning("No service path matches /. Defaulting to return TeaPot")
         listener.DefaultActions.append(tea_pot(True))
@@ -427,11 +447,7 @@ def add_extra_certificate(listener_stack, listener, cert_arn):
     :param listener: The listener to add the certificate to
     :param cert_arn: The identifier of the certificate
     """
-    cert_arn_re = re.compile(
-        r"((?:^arn:aws(?:-[a-z]+)?:acm:[\S]+:[0-9]+:certificate/)"
-        r"([a-z0-9]{8}(?:-[a-z0-9]{4}){3}-[a-z0-9]{12})$)"
-    )
-    if cert_arn_re.match(cert_arn):
+    if CERT_ARN_RE.match(cert_arn):
         cert_arn_id = cert_arn
     elif isinstance(cert_arn, str) and cert_arn.find(ACM_KEY) < 0:
         cert_arn_id = f"{ACM_KEY}::{cert_arn}"
@@ -496,7 +512,8 @@ def handle_import_cognito_pool(
     the_pool: UserPool, listener_stack, settings: ComposeXSettings
 ) -> tuple:
     """
-    Function to map AWS Cognito Pool to attributes
+    Function to map AWS Cognito Pool to attributes, as (pool id, pool arn, pool domain).
+    Pools created in the template have no domain, for which the pool domain is None.
     """
     if the_pool.cfn_resource and not the_pool.mappings:
         pool_id_param = Parameter(
@@ -509,20 +526,24 @@ def handle_import_cognito_pool(
         listener_stack.Parameters.update(
             {
                 pool_id_param.title: Ref(the_pool.cfn_resource),
-                pool_arn.title: Ref(pool_arn),
+                pool_arn.title: GetAtt(
+                    the_pool.cfn_resource, USERPOOL_ARN.return_value
+                ),
             }
         )
-        return Ref(pool_id_param), Ref(pool_arn)
+        return Ref(pool_id_param), Ref(pool_arn), None
     elif the_pool.mappings and not the_pool.cfn_resource:
+        mapping_key = the_pool.module.mapping_key
         add_update_mapping(
             listener_stack.stack_template,
-            the_pool.module.mapping_key,
-            settings.mappings[the_pool.module.mapping_key],
+            mapping_key,
+            settings.mappings[mapping_key],
         )
+        logical_name = the_pool.logical_name
         return (
-            FindInMap(COGNITO_MAP, the_pool.logical_name, USERPOOL_ID.title),
-            FindInMap(COGNITO_MAP, the_pool.logical_name, USERPOOL_ARN.return_value),
-            FindInMap(COGNITO_MAP, the_pool.logical_name, USERPOOL_DOMAIN.title),
+            FindInMap(COGNITO_MAP, logical_name, USERPOOL_ID.title),
+            FindInMap(COGNITO_MAP, logical_name, USERPOOL_ARN.return_value),
+            FindInMap(COGNITO_MAP, logical_name, USERPOOL_DOMAIN.title),
         )
 
 
@@ -534,20 +555,34 @@ def import_cognito_pool(src_name, settings: ComposeXSettings, listener_stack):
         raise LookupError(
             f"There is no {COGNITO_KEY} defined in your docker-compose files"
         )
-    pools = [
-        res
+    pools = {
+        res.name: res
         for res in settings.x_resources
         if res.module.res_key == "x-cognito_userpool"
-    ]
-    if src_name not in [__pool.name for __pool in pools]:
-        raise KeyError(
-            f"{COGNITO_KEY} - pool {src_name} not found",
-            [__pool.name for __pool in pools],
-        )
-    for pool in pools:
-        if src_name == pool.name:
-            return handle_import_cognito_pool(pool, listener_stack, settings)
-    raise LookupError("Failed to identify the cognito userpool to use", src_name)
+    }
+    pool = pools.get(src_name)
+    if pool is None:
+        raise KeyError(f"{COGNITO_KEY} - pool {src_name} not found", list(pools))
+    return handle_import_cognito_pool(pool, listener_stack, settings)
+
+
+def get_cognito_pool_domain(
+    pool_params: tuple, cognito_auth_config: dict, pool_name: str
+):
+    """
+    Function to get the UserPoolDomain of the pool, or the one set in AuthenticateCognitoConfig for pools
+    which do not have a domain.
+
+    :raises ValueError: if the pool has no domain and AuthenticateCognitoConfig does not set one.
+    """
+    if pool_params[2] is not None:
+        return pool_params[2]
+    if cognito_auth_config and keyisset("UserPoolDomain", cognito_auth_config):
+        return cognito_auth_config["UserPoolDomain"]
+    raise ValueError(
+        f"{COGNITO_KEY}.{pool_name} - The pool has no domain. "
+        "UserPoolDomain must be set in AuthenticateCognitoConfig"
+    )
 
 
 def add_acm_certs_arn(listener, src_value, settings, listener_stack):
@@ -559,16 +594,12 @@ def add_acm_certs_arn(listener, src_value, settings, listener_stack):
     :param listener_stack:
     :return:
     """
-    cert_arn_re = re.compile(
-        r"((?:^arn:aws(?:-[a-z]+)?:acm:[\S]+:[0-9]+:certificate/)"
-        r"([a-z0-9]{8}(?:-[a-z0-9]{4}){3}-[a-z0-9]{12})$)"
-    )
-    if not cert_arn_re.match(src_value):
+    if not CERT_ARN_RE.match(src_value):
         raise ValueError(
             "The CertificateArn is not valid. Got",
             src_value,
             "Expected",
-            cert_arn_re.pattern,
+            CERT_ARN_RE.pattern,
         )
     LOG.debug(
         f"{RES_KEY}.{listener.name} - Adding new ACM Certificate from defined ARN {src_value}"
@@ -594,39 +625,60 @@ def match_target_group_to_listener_target(
     return True
 
 
-def map_service_target(lb, listener_service_def: dict) -> None:
+def index_lb_target_groups(lb) -> dict:
+    """
+    Indexes the target groups of the LB families by (family name, service name), in the order
+    they are defined in the families targets.
+    """
+    index: dict = {}
+    indexed_families: set = set()
+    for target in lb.families_targets:
+        family = target[0]
+        if id(family) in indexed_families:
+            continue
+        indexed_families.add(id(family))
+        for target_group in family.target_groups:
+            index.setdefault(
+                (target_group.family.name, target_group.service.name), []
+            ).append(target_group)
+    return index
+
+
+def map_service_target(
+    lb, listener_service_def: dict, target_groups_index: dict = None
+) -> None:
     """
     Function to iterate over targets to map the service and its defined TargetGroup ARN
     """
     target_parts = LISTENER_TARGET_RE.match(listener_service_def["name"])
     if not target_parts:
         raise ValueError()
-    for target in lb.families_targets:
-        family_target_groups: list[ComposeTargetGroup] = target[0].target_groups
-        for target_group in family_target_groups:
-            mapped = match_target_group_to_listener_target(
-                target_group, listener_service_def, target_parts
-            )
-            if mapped:
-                break
+    if target_groups_index is None:
+        target_groups_index = index_lb_target_groups(lb)
+    for target_group in target_groups_index.get(
+        (target_parts.group("family"), target_parts.group("container")), ()
+    ):
+        if match_target_group_to_listener_target(
+            target_group, listener_service_def, target_parts
+        ):
+            break
 
 
 def validate_duplicate_targets(lb: Elbv2, listener: ComposeListener) -> None:
-    t_targets = list(lb.services.keys())
-    duplicate_services: bool = len(t_targets) != len(set(t_targets))
-    if duplicate_services:
-        for listener_target in listener.services:
-            parts = LISTENER_TARGET_RE.match(listener_target["name"])
-            if not parts:
-                raise ValueError(
-                    "{lb.module.res_key}.{lb.name} - Listener {listener.port}"
-                    " - Target name definition is invalid. Must comply to",
-                    LISTENER_TARGET_RE.pattern,
-                )
-            if listener_target["name"] and parts and not parts.group("port"):
-                raise ValueError(
-                    f"{lb.module.res_key}.{lb.name} - Listener {listener.def_port}"
-                    f" - Target service {listener_target['name']} is defined more than once in "
-                    "`Services`. You must specify the port with format",
-                    LISTENER_TARGET_RE.pattern,
-                )
+    if len(lb.services) == len(set(lb.services)):
+        return
+    for listener_target in listener.services:
+        parts = LISTENER_TARGET_RE.match(listener_target["name"])
+        if not parts:
+            raise ValueError(
+                "{lb.module.res_key}.{lb.name} - Listener {listener.port}"
+                " - Target name definition is invalid. Must comply to",
+                LISTENER_TARGET_RE.pattern,
+            )
+        if listener_target["name"] and parts and not parts.group("port"):
+            raise ValueError(
+                f"{lb.module.res_key}.{lb.name} - Listener {listener.def_port}"
+                f" - Target service {listener_target['name']} is defined more than once in "
+                "`Services`. You must specify the port with format",
+                LISTENER_TARGET_RE.pattern,
+            )
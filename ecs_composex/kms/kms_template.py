@@ -17,26 +17,24 @@ def create_kms_template(template, new_keys, xstack):
 
     :param ecs_composex.common.settings.ComposeXSettings settings:
     """
-    mono_template = False
-    if len(new_keys) <= CFN_MAX_OUTPUTS:
-        mono_template = True
-
+    mono_template = len(new_keys) <= CFN_MAX_OUTPUTS
+    keys_outputs: list = []
     for key in new_keys:
         key.stack = xstack
         key.define_kms_key()
         if key and key.cfn_resource:
             key.init_outputs()
             key.generate_outputs()
+            keys_outputs += key.outputs
             if mono_template:
                 template.add_resource(key.cfn_resource)
                 key.handle_key_settings(template)
-                add_outputs(template, key.outputs)
-            elif not mono_template:
+            else:
                 key_template = build_template(
                     f"Template for KMS key {key.logical_name}"
                 )
                 key_template.add_resource(key.cfn_resource)
                 key.handle_key_settings(key_template)
-                add_outputs(template, key.outputs)
                 key_stack = ComposeXStack(key.logical_name, stack_template=key_template)
                 template.add_resource(key_stack)
+    add_outputs(template, keys_outputs)
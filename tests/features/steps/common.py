@@ -11,9 +11,24 @@ from ecs_composex.common.stacks import process_stacks
 from ecs_composex.ecs_composex import generate_full_template
 from ecs_composex.exceptions import ComposeBaseException
 
+HERE = path.abspath(path.dirname(__file__))
+ROOT = path.abspath(path.join(HERE, "../../../"))
 
-def here():
-    return path.abspath(path.dirname(__file__))
+
+def resolve_path(file_name: str) -> str:
+    return path.abspath(path.join(ROOT, file_name))
+
+
+def build_settings(context, cases_path: list) -> ComposeXSettings:
+    return ComposeXSettings(
+        profile_name=getattr(context, "profile_name", None),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: cases_path,
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
 
 
 @given("With {file_path}")
@@ -28,22 +43,8 @@ def step_impl(context, file_path):
 
 @given("I use defined files as input to define execution settings")
 def step_impl(context):
-    cases_path = [
-        path.abspath(f"{here()}/../../../{file_name}") for file_name in context.files
-    ]
-    context.settings = ComposeXSettings(
-        profile_name=(
-            getattr(context, "profile_name")
-            if hasattr(context, "profile_name")
-            else None
-        ),
-        **{
-            ComposeXSettings.name_arg: "test",
-            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
-            ComposeXSettings.input_file_arg: cases_path,
-            ComposeXSettings.format_arg: "yaml",
-        },
-    )
+    cases_path = [resolve_path(file_name) for file_name in context.files]
+    context.settings = build_settings(context, cases_path)
     context.settings.set_bucket_name_from_account_id()
 
 
@@ -54,24 +55,10 @@ def step_impl(context):
 
 @then("I use defined files as input expecting an error")
 def step_impl(context):
-    cases_path = [
-        path.abspath(f"{here()}/../../../{file_name}") for file_name in context.files
-    ]
+    cases_path = [resolve_path(file_name) for file_name in context.files]
     print(cases_path)
     with raises(Exception):
-        context.settings = ComposeXSettings(
-            profile_name=(
-                getattr(context, "profile_name")
-                if hasattr(context, "profile_name")
-                else None
-            ),
-            **{
-                ComposeXSettings.name_arg: "test",
-                ComposeXSettings.command_arg: ComposeXSettings.render_arg,
-                ComposeXSettings.input_file_arg: cases_path,
-                ComposeXSettings.format_arg: "yaml",
-            },
-        )
+        context.settings = build_settings(context, cases_path)
         context.settings.set_bucket_name_from_account_id()
         generate_full_template(context.settings)
 
@@ -85,21 +72,9 @@ def step_impl(context, file_path):
     :param str file_path:
     :return:
     """
-    cases_path = path.abspath(f"{here()}/../../../{file_path}")
-
-    context.settings = ComposeXSettings(
-        profile_name=(
-            getattr(context, "profile_name")
-            if hasattr(context, "profile_name")
-            else None
-        ),
-        **{
-            ComposeXSettings.name_arg: "test",
-            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
-            ComposeXSettings.input_file_arg: [cases_path],
-            ComposeXSettings.format_arg: "yaml",
-        },
-    )
+    cases_path = resolve_path(file_path)
+
+    context.settings = build_settings(context, [cases_path])
     context.settings.set_bucket_name_from_account_id()
 
 
@@ -115,21 +90,9 @@ def step_impl(context, file_path, override_file):
     :param str override_file:
     :return:
     """
-    cases_path = path.abspath(f"{here()}/../../../{file_path}")
-    override_path = path.abspath(f"{here()}/../../../{override_file}")
-    context.settings = ComposeXSettings(
-        profile_name=(
-            getattr(context, "profile_name")
-            if hasattr(context, "profile_name")
-            else None
-        ),
-        **{
-            ComposeXSettings.name_arg: "test",
-            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
-            ComposeXSettings.input_file_arg: [cases_path, override_path],
-            ComposeXSettings.format_arg: "yaml",
-        },
-    )
+    cases_path = resolve_path(file_path)
+    override_path = resolve_path(override_file)
+    context.settings = build_settings(context, [cases_path, override_path])
     context.settings.set_bucket_name_from_account_id()
 
 
@@ -2,11 +2,23 @@
 # SPDX-License-Identifier: MPL-2.0
 # Copyright 2020-2025 John Mille<john@compose-x.io>
 
+import re
+from datetime import datetime, timedelta, timezone
+
 from pytest import fixture, raises
 
+from ecs_composex.common import aws
 from ecs_composex.common.aws import (
+    define_tagsgroups_filter_tags,
+    find_aws_resource_arn_from_tags_api,
+    get_arns_names,
+    get_cached_client,
+    get_cross_role_session,
+    get_resources_from_tags,
     handle_multi_results,
     handle_search_results,
+    is_iam_role_arn,
+    render_change_set_changes,
     validate_search_input,
 )
 
@@ -44,6 +56,13 @@ def test_multi_arns_exceptions(multi_matching_arns):
             "bucket",
             r"(?:arn:aws:s3:::)([a-z0-9-.]+$)",
         )
+    assert handle_multi_results(
+        multi_matching_arns + ["arn:aws:s3:::bucketxyz"],
+        "bucketabcd",
+        "bucket",
+        r"(?:arn:aws:s3:::)([a-z0-9-.]+$)",
+        allow_multi=True,
+    ) == multi_matching_arns + ["arn:aws:s3:::bucketxyz"]
 
 
 def test_handle_results_exceptions():
@@ -61,3 +80,156 @@ def test_validate_search_input_exceptions(res_types):
         validate_search_input(res_types, "abcd")
     with raises(KeyError):
         validate_search_input(res_types, 1)
+
+
+def test_render_change_set_changes():
+    changes = [
+        {
+            "ResourceChange": {
+                "LogicalResourceId": "bucket",
+                "ResourceType": "AWS::S3::Bucket",
+                "Action": "Add",
+            }
+        }
+    ]
+    assert render_change_set_changes(changes) == "\n".join(
+        [
+            "===================  ===============  ========",
+            "LogicalResourceId    ResourceType     Action",
+            "===================  ===============  ========",
+            "bucket               AWS::S3::Bucket  Add",
+            "===================  ===============  ========",
+        ]
+    )
+
+
+def test_get_arns_names(res_types):
+    arns = [
+        "arn:aws:rds:eu-west-1:123456789012:cluster:cluster-a",
+        "arn:aws:rds:eu-west-1:123456789012:db:db-a",
+        "arn:aws:rds:eu-west-1:123456789012:cluster:cluster-b",
+    ]
+    assert get_arns_names(re.compile(res_types["cluster"]["regexp"]), arns) == [
+        (arns[0], "cluster-a"),
+        (arns[2], "cluster-b"),
+    ]
+    assert get_arns_names(
+        re.compile(r"(?:arn:aws:s3:::)([a-z0-9-.]+$)"),
+        ["arn:aws:s3:::bucket-a", "xarn:aws:s3:::bucket-b", "arn:aws:s3:::bucket-c"],
+    ) == [("arn:aws:s3:::bucket-a", "bucket-a"), ("arn:aws:s3:::bucket-c", "bucket-c")]
+
+
+def test_define_tagsgroups_filter_tags():
+    expected = (
+        {"Key": "costcentre", "Values": ("lambda",)},
+        {"Key": "environment", "Values": ("prod", "staging")},
+    )
+    assert (
+        define_tagsgroups_filter_tags(
+            [{"environment": ["staging", "prod"]}, {"costcentre": "lambda"}]
+        )
+        == expected
+    )
+    assert (
+        define_tagsgroups_filter_tags(
+            {"environment": ["staging", "prod"], "costcentre": "lambda"}
+        )
+        == expected
+    )
+    with raises(TypeError):
+        define_tagsgroups_filter_tags("environment")
+
+
+def test_is_iam_role_arn():
+    assert is_iam_role_arn("arn:aws:iam::123456789012:role/lookup")
+    assert is_iam_role_arn("arn:aws-cn:iam::123456789012:role/path/lookup")
+    assert not is_iam_role_arn("arn:aws:iam::12345678901:role/lookup")
+    assert not is_iam_role_arn("arn:aws:iam::123456789012:user/lookup")
+    assert not is_iam_role_arn("arn:aws:iam::123456789012:role/")
+    assert not is_iam_role_arn("arn:aws:iam:eu-west-1:123456789012:role/lookup")
+
+
+def test_get_resources_from_tags_cache_per_session(monkeypatch):
+    class Session:
+        pass
+
+    calls = []
+
+    def iter_resources(session, resource_types, search_tags):
+        calls.append(session)
+        yield {"ResourceARN": "arn:aws:s3:::bucket-a"}
+
+    monkeypatch.setattr(aws, "iter_resources_from_tags", iter_resources)
+    session, other_session = Session(), Session()
+    tags = ({"Key": "environment", "Values": ("prod",)},)
+    first = get_resources_from_tags(session, "s3", tags)
+    assert get_resources_from_tags(session, "s3", tags) is first
+    get_resources_from_tags(other_session, "s3", tags)
+    assert calls == [session, other_session]
+    del session, other_session, calls[:]
+    assert not len(aws._RESOURCES_LOOKUP_CACHE)
+
+
+def test_get_cached_client_per_session():
+    class Session:
+        def client(self, service, region_name=None):
+            return object()
+
+    session, other_session = Session(), Session()
+    client = get_cached_client(session, "cloudformation")
+    assert get_cached_client(session, "cloudformation") is client
+    assert get_cached_client(session, "cloudformation", "us-east-1") is not client
+    assert get_cached_client(other_session, "cloudformation") is not client
+    del session, other_session
+    assert not len(aws._CLIENTS_CACHE)
+
+
+def test_get_cross_role_session_cache(monkeypatch):
+    class Session:
+        pass
+
+    expirations = {}
+
+    def assume_role(session, arn, session_name=None, region=None, **kwargs):
+        role_session = Session()
+        expiration = expirations.get(arn, timedelta(minutes=15))
+        return role_session, {
+            "Credentials": {"Expiration": datetime.now(timezone.utc) + expiration}
+        }
+
+    monkeypatch.setattr(aws, "get_assume_role_session", assume_role)
+    monkeypatch.setattr(aws, "ASSUMED_ROLE_SESSIONS_CACHE_MAX_SIZE", 2)
+    session = Session()
+    role_a = "arn:aws:iam::123456789012:role/a"
+    role_session = get_cross_role_session(session, role_a)
+    assert get_cross_role_session(session, role_a) is role_session
+
+    expiring_role = "arn:aws:iam::123456789012:role/expiring"
+    expirations[expiring_role] = timedelta(seconds=30)
+    expiring_session = get_cross_role_session(session, expiring_role)
+    assert get_cross_role_session(session, expiring_role) is not expiring_session
+
+    get_cross_role_session(session, "arn:aws:iam::123456789012:role/b")
+    assert len(aws._ASSUMED_ROLE_SESSIONS_CACHE[session]) == 2
+    assert get_cross_role_session(session, role_a) is not role_session
+
+
+def test_find_aws_resource_arn_from_tags_api_lists_all_matches(monkeypatch):
+    class Session:
+        pass
+
+    arns = [f"arn:aws:s3:::bucket-{index}" for index in range(4)]
+
+    def iter_resources(session, resource_types, search_tags):
+        yield from ({"ResourceARN": arn} for arn in arns)
+
+    monkeypatch.setattr(aws, "iter_resources_from_tags", iter_resources)
+    session = Session()
+    info = {"Tags": {"environment": "prod"}}
+    with raises(LookupError) as error:
+        find_aws_resource_arn_from_tags_api(info, session, "s3")
+    assert error.value.args[1] == arns
+    assert (
+        find_aws_resource_arn_from_tags_api(info, session, "s3", allow_multi=True)
+        == arns
+    )
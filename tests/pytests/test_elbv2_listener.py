@@ -0,0 +1,122 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+from types import SimpleNamespace
+
+from pytest import raises
+from troposphere import Ref, Template
+from troposphere.cognito import UserPool as CfnUserPool
+
+from ecs_composex.elbv2.elbv2_stack import elbv2_listener
+from ecs_composex.elbv2.elbv2_stack.elbv2_listener import ComposeListener
+from ecs_composex.elbv2.elbv2_stack.helpers import (
+    handle_import_cognito_pool,
+    index_lb_target_groups,
+    map_service_target,
+    validate_listeners_duplicates,
+)
+
+
+def test_handle_certificates_checks_source_value(monkeypatch):
+    handled = []
+
+    def handler(listener, value, settings, stack):
+        handled.append(value)
+
+    monkeypatch.setitem(elbv2_listener.CERTIFICATE_SOURCES, "x-acm", handler)
+    monkeypatch.setitem(elbv2_listener.CERTIFICATE_SOURCES, "CertificateArn", handler)
+    listener = SimpleNamespace(
+        name="listener",
+        definition={
+            "Certificates": [
+                {"x-acm": "my-cert"},
+                {"CertificateArn": {"Ref": "CertArn"}},
+                {"Unknown": "value"},
+                {},
+                "not-a-dict",
+            ]
+        },
+    )
+    ComposeListener.handle_certificates(listener, None, None)
+    assert handled == ["my-cert"]
+
+
+def test_map_service_target_uses_target_groups_index():
+    family = SimpleNamespace(name="app", target_groups=[])
+    for service_name, port in (("web", 80), ("web", 8080), ("api", 80)):
+        family.target_groups.append(
+            SimpleNamespace(
+                title=f"{service_name}{port}",
+                family=family,
+                service=SimpleNamespace(name=service_name),
+                port=port,
+            )
+        )
+    lb = SimpleNamespace(families_targets=[(family,), (family,)])
+    index = index_lb_target_groups(lb)
+    assert [tgt.title for tgt in index[("app", "web")]] == ["web80", "web8080"]
+
+    with_port = {"name": "app:web:8080"}
+    map_service_target(lb, with_port, index)
+    assert with_port["target_arn"].data["Ref"] is family.target_groups[1]
+
+    without_port = {"name": "app:web"}
+    map_service_target(lb, without_port)
+    assert without_port["target_arn"].data["Ref"] is family.target_groups[0]
+
+    unknown = {"name": "app:worker"}
+    map_service_target(lb, unknown, index)
+    assert "target_arn" not in unknown
+
+
+def test_validate_listeners_duplicates():
+    validate_listeners_duplicates("lb", [80, 443])
+    with raises(ValueError, match=r"lb - More than one listener with port \{443\}"):
+        validate_listeners_duplicates("lb", [80, 443, 443])
+
+
+def test_handle_cognito_pools_created_pool(monkeypatch):
+    pool = SimpleNamespace(
+        logical_name="PoolA", cfn_resource=CfnUserPool("PoolA"), mappings={}
+    )
+    listener_stack = SimpleNamespace(
+        title="ListenerStack", stack_template=Template(), Parameters={}
+    )
+    pool_params = handle_import_cognito_pool(pool, listener_stack, None)
+    assert len(pool_params) == 3 and pool_params[2] is None
+    assert listener_stack.Parameters["PoolAUserPoolId"].to_dict() == {"Ref": "PoolA"}
+
+    monkeypatch.setattr(
+        elbv2_listener,
+        "import_cognito_pool",
+        lambda name, settings, stack: handle_import_cognito_pool(pool, stack, settings),
+    )
+    listener = SimpleNamespace(
+        services=[
+            {
+                "name": "app:web",
+                "CreateCognitoClient": {"UserPoolId": "pool-a"},
+                "AuthenticateCognitoConfig": {"UserPoolDomain": "my-domain"},
+            },
+            {
+                "name": "app:api",
+                "AuthenticateCognitoConfig": {
+                    "UserPoolArn": "x-cognito_userpool::pool-a",
+                    "UserPoolDomain": "my-domain",
+                },
+            },
+        ]
+    )
+    ComposeListener.handle_cognito_pools(listener, None, listener_stack)
+    for target in listener.services:
+        auth_config = target["AuthenticateCognitoConfig"]
+        assert auth_config["UserPoolDomain"] == "my-domain"
+        assert isinstance(auth_config["UserPoolArn"], Ref)
+
+    listener = SimpleNamespace(
+        services=[
+            {"name": "app:other", "CreateCognitoClient": {"UserPoolId": "pool-a"}}
+        ]
+    )
+    with raises(ValueError, match="UserPoolDomain must be set"):
+        ComposeListener.handle_cognito_pools(listener, None, listener_stack)
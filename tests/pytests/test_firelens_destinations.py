@@ -0,0 +1,61 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+from types import SimpleNamespace
+
+from pytest import fixture, raises
+
+from ecs_composex.ecs.ecs_firelens.ecs_firelens_advanced.advanced_firehose import (
+    FireLensFirehoseManagedDestination,
+)
+from ecs_composex.ecs.ecs_firelens.ecs_firelens_advanced.advanced_kinesis import (
+    FireLensKinesisManagedDestination,
+)
+
+
+@fixture()
+def advanced_config():
+    return SimpleNamespace(extra_env_vars={}, family=None, service=None)
+
+
+def test_kinesis_stream_arn_destination(advanced_config):
+    destination = FireLensKinesisManagedDestination(
+        {
+            "stream": "arn:aws:kinesis:eu-west-1:123456789012:stream/my-app.logs",
+            "region": "eu-west-1",
+            "time_key": "",
+            "compression": "gzip",
+        },
+        advanced_config,
+        None,
+    )
+    assert destination.delivery_stream == "my-app.logs"
+    assert advanced_config.extra_env_vars == {"MY_APP_LOGS": "my-app.logs"}
+    assert destination.output_definition == {
+        "region": "eu-west-1",
+        "stream": r"${MY_APP_LOGS}",
+        "compression": "gzip",
+    }
+    assert not destination.is_cross_account
+
+
+def test_firehose_delivery_stream_arn_destination(advanced_config):
+    destination = FireLensFirehoseManagedDestination(
+        {
+            "delivery_stream": "arn:aws:firehose:eu-west-1:123456789012:deliverystream/my-app-logs",
+        },
+        advanced_config,
+        None,
+    )
+    assert destination.delivery_stream == "my-app-logs"
+    assert destination.region == "eu-west-1"
+    assert advanced_config.extra_env_vars == {"MY_APP_LOGS": "my-app-logs"}
+
+
+def test_invalid_stream_arn_destination(advanced_config):
+    with raises(ValueError):
+        FireLensKinesisManagedDestination(
+            {"stream": "arn:aws:kinesis:eu-west-1:123456789012:table/not-a-stream"},
+            advanced_config,
+            None,
+        )